@@ -1,5 +1,23 @@
-from app.models import Category, Client, Order, OrderItem, Product
+from app.exports import get_export_orders, iter_csv, write_xlsx
+from app.forms import OrderExportForm
+from app.models import (
+    Category,
+    CategoryLabel,
+    Client,
+    Faq,
+    Order,
+    OrderItem,
+    OutboxEvent,
+    Product,
+)
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import Coalesce
+from django.http import FileResponse, StreamingHttpResponse
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
 
 
 class ClientAdmin(admin.ModelAdmin):
@@ -7,20 +25,194 @@ class ClientAdmin(admin.ModelAdmin):
     search_fields = ("username", "telegram_id")
 
 
+class CategoryListFilter(admin.RelatedFieldListFilter):
+    """Фильтр по категории: варианты с предками одним запросом."""
+
+    def field_choices(self, field, request, model_admin):
+        categories = Category.objects.with_labels().order_by("path")
+        return [(category.pk, str(category)) for category in categories]
+
+
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    extra = 0
+    autocomplete_fields = ("product",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("product")
+
+
+class OrderAdmin(admin.ModelAdmin):
+    list_display = (
+        "__str__",
+        "address",
+        "items_count",
+        "items_total",
+        "total_price",
+        "created_at",
+    )
+    list_select_related = ("client",)
+    search_fields = ("=id", "client__username", "=client__telegram_id")
+    autocomplete_fields = ("client",)
+    inlines = (OrderItemInline,)
+    date_hierarchy = "created_at"
+    ordering = ("-id",)
+    # точный COUNT(*) по всей таблице на каждой странице не нужен
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                items_count=Count("items"),
+                items_total=Coalesce(
+                    Sum(F("items__price") * F("items__quantity")),
+                    0,
+                    output_field=DecimalField(max_digits=20, decimal_places=2),
+                ),
+            )
+        )
+
+    @admin.display(description="Позиций", ordering="items_count")
+    def items_count(self, obj):
+        return obj.items_count
+
+    @admin.display(description="Сумма по товарам", ordering="items_total")
+    def items_total(self, obj):
+        return obj.items_total
+
+    def get_urls(self):
+        urls = [
+            path(
+                "export/",
+                self.admin_site.admin_view(self.export_view),
+                name="app_order_export",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def export_view(self, request):
+        """
+        Выгрузка заказов с товарами за период в CSV или XLSX.
+
+        Заказы читаются из БД порциями, CSV отдаётся по мере чтения,
+        XLSX собирается во временном файле и отдаётся частями.
+        """
+
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+
+        form = OrderExportForm(request.GET or None)
+        if not form.is_valid():
+            context = {
+                **self.admin_site.each_context(request),
+                "opts": self.opts,
+                "title": "Выгрузка заказов",
+                "form": form,
+            }
+            return TemplateResponse(
+                request, "admin/app/order/export.html", context
+            )
+
+        # без аннотаций списка: GROUP BY по всем заказам выгрузке не нужен
+        orders = get_export_orders(form.filter_orders(Order.objects.all()))
+        filename = f"orders_{timezone.localdate():%Y%m%d}"
+        if form.cleaned_data["format"] == OrderExportForm.FORMAT_CSV:
+            response = StreamingHttpResponse(
+                iter_csv(orders), content_type="text/csv; charset=utf-8"
+            )
+            response["Content-Disposition"] = (
+                f'attachment; filename="{filename}.csv"'
+            )
+            return response
+
+        return FileResponse(
+            write_xlsx(orders),
+            as_attachment=True,
+            filename=f"{filename}.xlsx",
+        )
+
+
+class OrderItemAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "order", "quantity", "price")
+    list_select_related = ("order__client", "product")
+    autocomplete_fields = ("order", "product")
+    ordering = ("-id",)
+    show_full_result_count = False
+
+
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ("name", "parent")
+    list_display = ("name", "parent_name")
+    # порядок обхода дерева: потомки сразу после родителя
+    ordering = ("path",)
+    list_select_related = ("parent",)
     search_fields = ("name",)
+    autocomplete_fields = ("parent",)
+
+    def get_queryset(self, request):
+        # подписи для автодополнения категорий в товарах и родителях
+        return super().get_queryset(request).with_labels()
+
+    @admin.display(description="Родитель", ordering="parent__name")
+    def parent_name(self, obj):
+        return obj.parent.name if obj.parent else "—"
 
 
 class ProductAdmin(admin.ModelAdmin):
-    list_display = ("name", "category", "price")
+    list_display = ("name", "category_label", "price")
     search_fields = ("name", "description")
-    list_filter = ("category",)
+    list_filter = (("category", CategoryListFilter),)
+    autocomplete_fields = ("category",)
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(category_label=CategoryLabel("category__path"))
+        )
+
+    @admin.display(description="Категория", ordering="category__path")
+    def category_label(self, obj):
+        return obj.category_label
+
+
+class FaqAdmin(admin.ModelAdmin):
+    list_display = ("question", "position", "is_active", "updated_at")
+    list_editable = ("position", "is_active")
+    search_fields = ("question", "answer")
+    list_filter = ("is_active",)
+
+
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = (
+        "idempotency_key",
+        "event_type",
+        "status",
+        "attempts",
+        "available_at",
+        "processed_at",
+    )
+    list_filter = ("status", "event_type")
+    search_fields = ("idempotency_key",)
+    readonly_fields = ("created_at", "processed_at", "last_error")
+    actions = ("retry_events",)
+
+    @admin.action(description="Повторить обработку")
+    def retry_events(self, request, queryset):
+        updated = queryset.exclude(status=OutboxEvent.Status.DONE).update(
+            status=OutboxEvent.Status.PENDING,
+            available_at=timezone.now(),
+            attempts=0,
+        )
+        self.message_user(request, f"Поставлено в очередь: {updated}")
 
 
 admin.site.register(Client, ClientAdmin)
-admin.site.register(Order)
-admin.site.register(OrderItem)
+admin.site.register(Order, OrderAdmin)
+admin.site.register(OrderItem, OrderItemAdmin)
 
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Product, ProductAdmin)
+admin.site.register(Faq, FaqAdmin)
+admin.site.register(OutboxEvent, OutboxEventAdmin)
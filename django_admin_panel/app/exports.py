@@ -0,0 +1,90 @@
+import csv
+import tempfile
+from typing import Iterable, Iterator, List
+
+from app.models import Order, OrderItem
+from django.db.models import Prefetch, QuerySet
+from django.utils import timezone
+from openpyxl import Workbook
+
+# заказов на одну выборку серверного курсора (и одну догрузку товаров)
+EXPORT_CHUNK_SIZE = 2000
+
+HEADERS = [
+    "Заказ",
+    "Дата",
+    "Клиент",
+    "Telegram ID",
+    "Адрес",
+    "Товары",
+    "Общая сумма (₽)",
+]
+
+
+def get_export_orders(orders: QuerySet) -> Iterator[Order]:
+    """
+    Заказы с клиентом и товарами порциями по EXPORT_CHUNK_SIZE:
+    на порцию один запрос заказов и один запрос их позиций.
+    """
+
+    items = OrderItem.objects.select_related("product").order_by("id")
+    return (
+        orders.select_related("client")
+        .prefetch_related(Prefetch("items", queryset=items))
+        .order_by("id")
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def order_to_row(order: Order) -> List:
+    items_str = "\n".join(
+        f"{item.product.name if item.product else '—'} "
+        f"(x{item.quantity}) — {item.price:.2f}₽"
+        for item in order.items.all()
+    )
+    return [
+        order.id,
+        # openpyxl не пишет даты с часовым поясом
+        timezone.localtime(order.created_at).replace(tzinfo=None),
+        order.client.username,
+        order.client.telegram_id,
+        order.address,
+        items_str,
+        order.total_price,
+    ]
+
+
+class Echo:
+    """Файлоподобный объект, который возвращает записанное."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(orders: Iterable[Order]) -> Iterator[str]:
+    writer = csv.writer(Echo())
+    # BOM, чтобы Excel открыл UTF-8 без выбора кодировки
+    yield "\ufeff" + writer.writerow(HEADERS)
+    for order in orders:
+        yield writer.writerow(order_to_row(order))
+
+
+def write_xlsx(orders: Iterable[Order]):
+    """
+    Пишет заказы в XLSX в режиме write-only во временный файл
+    и возвращает его открытым на начале.
+
+    Строки сбрасываются на диск по мере записи, поэтому память не
+    зависит от числа заказов.
+    """
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Заказы")
+    ws.append(HEADERS)
+    for order in orders:
+        ws.append(order_to_row(order))
+
+    file = tempfile.TemporaryFile()
+    wb.save(file)
+    file.seek(0)
+    return file
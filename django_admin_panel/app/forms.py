@@ -0,0 +1,45 @@
+from datetime import datetime, time, timedelta
+
+from django import forms
+from django.utils import timezone
+
+
+class OrderExportForm(forms.Form):
+    """Период и формат выгрузки заказов."""
+
+    FORMAT_CSV = "csv"
+    FORMAT_XLSX = "xlsx"
+
+    date_from = forms.DateField(label="С даты", required=False)
+    date_to = forms.DateField(label="По дату", required=False)
+    format = forms.ChoiceField(
+        label="Формат",
+        choices=((FORMAT_XLSX, "Excel (XLSX)"), (FORMAT_CSV, "CSV")),
+        initial=FORMAT_XLSX,
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        date_from = cleaned_data.get("date_from")
+        date_to = cleaned_data.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise forms.ValidationError("Начало периода позже его конца.")
+        return cleaned_data
+
+    def filter_orders(self, orders):
+        """Фильтр по created_at; дата «по» включается целиком."""
+
+        tz = timezone.get_current_timezone()
+        date_from = self.cleaned_data.get("date_from")
+        date_to = self.cleaned_data.get("date_to")
+        if date_from:
+            orders = orders.filter(
+                created_at__gte=datetime.combine(date_from, time.min, tz)
+            )
+        if date_to:
+            orders = orders.filter(
+                created_at__lt=datetime.combine(
+                    date_to + timedelta(days=1), time.min, tz
+                )
+            )
+        return orders
@@ -0,0 +1,62 @@
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Telegram всё равно ужимает фото до 1280 px по большей стороне
+OPTIMIZED_MAX_SIDE = 1280
+THUMBNAIL_MAX_SIDE = 320
+JPEG_QUALITY = 85
+
+
+@dataclass(frozen=True)
+class ProcessedPhoto:
+    """Результат обработки загруженного фото товара."""
+
+    optimized: ContentFile
+    thumbnail: ContentFile
+    width: int
+    height: int
+    content_hash: str
+
+
+def _to_jpeg(image, max_side):
+    image = image.copy()
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    # EXIF и прочие метаданные не передаются в save — они отбрасываются
+    image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    return image, buffer.getvalue()
+
+
+def process_product_photo(photo):
+    """
+    Готовит фото товара для Telegram: поворот по EXIF, RGB,
+    уменьшение, перекомпрессия в JPEG без метаданных, миниатюра.
+    """
+    photo.seek(0)
+    with Image.open(photo) as source:
+        image = ImageOps.exif_transpose(source)
+        if image.mode != "RGB":
+            # прозрачность заливаем белым, JPEG её не поддерживает
+            background = Image.new("RGB", image.size, "white")
+            rgba = image.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            image = background
+
+        optimized, optimized_bytes = _to_jpeg(image, OPTIMIZED_MAX_SIDE)
+        _, thumbnail_bytes = _to_jpeg(image, THUMBNAIL_MAX_SIDE)
+    photo.seek(0)
+
+    content_hash = hashlib.sha256(optimized_bytes).hexdigest()
+    stem = os.path.splitext(os.path.basename(photo.name))[0]
+    return ProcessedPhoto(
+        optimized=ContentFile(optimized_bytes, name=f"{stem}.jpg"),
+        thumbnail=ContentFile(thumbnail_bytes, name=f"{stem}_thumb.jpg"),
+        width=optimized.width,
+        height=optimized.height,
+        content_hash=content_hash,
+    )
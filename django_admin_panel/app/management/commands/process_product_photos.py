@@ -0,0 +1,32 @@
+from app.images import process_product_photo
+from app.models import Product
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Готовит версии фото для Telegram у товаров, где их ещё нет."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Переобработать фото всех товаров.",
+        )
+
+    def handle(self, *args, **options):
+        products = Product.objects.exclude(photo="")
+        if not options["all"]:
+            products = products.filter(photo_optimized="")
+
+        processed = 0
+        for product in products.iterator():
+            try:
+                with product.photo.open("rb") as photo:
+                    product.set_processed_photo(process_product_photo(photo))
+            except (OSError, ValueError) as e:
+                self.stderr.write(f"Товар {product.pk}: {e}")
+                continue
+            product.save()
+            processed += 1
+
+        self.stdout.write(f"Обработано фото: {processed}")
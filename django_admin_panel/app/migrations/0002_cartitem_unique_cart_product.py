@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:24
+
+from django.db import migrations, models
+
+# Схлопываем дубли (cart, product), накопленные до появления ограничения:
+# количество суммируется в строку с минимальным id, остальные удаляются.
+MERGE_DUPLICATE_CART_ITEMS = """
+UPDATE app_cartitem AS ci
+SET quantity = dup.total
+FROM (
+    SELECT MIN(id) AS keep_id, SUM(quantity) AS total
+    FROM app_cartitem
+    GROUP BY cart_id, product_id
+    HAVING COUNT(*) > 1
+) AS dup
+WHERE ci.id = dup.keep_id;
+
+DELETE FROM app_cartitem AS ci
+USING app_cartitem AS keep
+WHERE ci.cart_id = keep.cart_id
+  AND ci.product_id = keep.product_id
+  AND ci.id > keep.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            MERGE_DUPLICATE_CART_ITEMS, reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.AddConstraint(
+            model_name="cartitem",
+            constraint=models.UniqueConstraint(
+                fields=("cart", "product"),
+                name="app_cartitem_unique_cart_product",
+            ),
+        ),
+    ]
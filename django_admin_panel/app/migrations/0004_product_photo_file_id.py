@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0003_catalogversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="photo_hash",
+            field=models.CharField(
+                blank=True, db_default="", editable=False, max_length=64
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="telegram_file_id",
+            field=models.CharField(
+                blank=True, db_default="", editable=False, max_length=255
+            ),
+        ),
+    ]
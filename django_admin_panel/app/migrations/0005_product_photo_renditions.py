@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0004_product_photo_file_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="photo_height",
+            field=models.PositiveIntegerField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="photo_optimized",
+            field=models.ImageField(
+                blank=True,
+                db_default="",
+                editable=False,
+                upload_to="shared_media/optimized/",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="photo_thumbnail",
+            field=models.ImageField(
+                blank=True,
+                db_default="",
+                editable=False,
+                upload_to="shared_media/thumbnails/",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="photo_width",
+            field=models.PositiveIntegerField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+    ]
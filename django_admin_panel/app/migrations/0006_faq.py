@@ -0,0 +1,72 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:39
+
+from django.db import migrations, models
+
+# вопросы, которые раньше были зашиты в код бота
+INITIAL_FAQS = (
+    (
+        "Как сделать заказ?",
+        "Чтобы сделать заказ, перейдите в каталог и выберите товар.",
+    ),
+    (
+        "Какие способы оплаты?",
+        "Мы принимаем оплату картой, через YooKassa и т.д.",
+    ),
+    (
+        "Как отменить заказ?",
+        "Напишите в поддержку, указав номер заказа.",
+    ),
+    (
+        "Сколько идет доставка?",
+        "Обычно доставка занимает 2-5 рабочих дней.",
+    ),
+)
+
+
+def create_initial_faqs(apps, schema_editor):
+    Faq = apps.get_model("app", "Faq")
+    Faq.objects.bulk_create(
+        Faq(question=question, answer=answer, position=position)
+        for position, (question, answer) in enumerate(INITIAL_FAQS)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0005_product_photo_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Faq",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("question", models.CharField(max_length=255)),
+                ("answer", models.TextField()),
+                (
+                    "position",
+                    models.PositiveIntegerField(db_default=0, default=0),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(db_default=True, default=True),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Вопрос FAQ",
+                "verbose_name_plural": "FAQ",
+                "ordering": ("position", "id"),
+            },
+        ),
+        migrations.RunPython(create_initial_faqs, migrations.RunPython.noop),
+    ]
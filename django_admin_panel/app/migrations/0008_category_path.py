@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-17 13:00
+
+from django.db import migrations, models
+
+# пути и глубина существующих категорий по цепочкам parent_id
+FILL_CATEGORY_PATHS = """
+WITH RECURSIVE tree (id, path, depth) AS (
+    SELECT id, '/' || id || '/', 0
+    FROM app_category
+    WHERE parent_id IS NULL
+    UNION ALL
+    SELECT child.id, tree.path || child.id || '/', tree.depth + 1
+    FROM app_category AS child
+    JOIN tree ON child.parent_id = tree.id
+)
+UPDATE app_category
+SET path = tree.path, depth = tree.depth
+FROM tree
+WHERE app_category.id = tree.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0007_outboxevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="depth",
+            field=models.PositiveSmallIntegerField(
+                db_default=0, editable=False
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="path",
+            field=models.CharField(
+                db_collation="C", db_default="", editable=False, max_length=255
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(fields=["path"], name="app_category_path_idx"),
+        ),
+        migrations.RunSQL(FILL_CATEGORY_PATHS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 5.2.1 on 2026-10-17 13:02
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY не блокирует запись, но не работает
+    # внутри транзакции
+    atomic = False
+
+    dependencies = [
+        ("app", "0008_category_path"),
+    ]
+
+    operations = [
+        # сначала составные индексы, затем удаление одиночных индексов
+        # внешних ключей, которые они покрывают
+        AddIndexConcurrently(
+            model_name="category",
+            index=models.Index(
+                fields=["parent", "name", "id"],
+                name="app_category_parent_name_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="category",
+            index=models.Index(
+                condition=models.Q(("parent__isnull", True)),
+                fields=["name", "id"],
+                name="app_category_root_name_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="orderitem",
+            index=models.Index(
+                fields=["order", "id"], name="app_orderitem_order_id_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="product",
+            index=models.Index(
+                fields=["category", "name", "id"],
+                name="app_product_category_name_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="cartitem",
+            name="cart",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="items",
+                to="app.cart",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="category",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="subcategories",
+                to="app.category",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="orderitem",
+            name="order",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="items",
+                to="app.order",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="category",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="products",
+                to="app.category",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="outboxevent",
+            name="app_outbox_pending_idx",
+        ),
+        AddIndexConcurrently(
+            model_name="outboxevent",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["available_at", "id"],
+                name="app_outbox_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+# Версию каталога поднимает сама БД: триггеры уровня оператора срабатывают
+# и на QuerySet.update(), bulk_create/bulk_update, массовые действия
+# админки и SQL в миграциях, которые обходят сигналы Django.
+# Запись ботом file_id фото (только telegram_file_id) версию не меняет,
+# иначе каждое первое открытие товара перечитывало бы весь каталог.
+CREATE_TRIGGERS = """
+CREATE OR REPLACE FUNCTION app_bump_catalog_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO app_catalogversion (id, version, updated_at)
+    VALUES (1, 1, now())
+    ON CONFLICT (id) DO UPDATE
+    SET version = app_catalogversion.version + 1, updated_at = now();
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER app_category_bump_catalog_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON app_category
+FOR EACH STATEMENT EXECUTE FUNCTION app_bump_catalog_version();
+
+CREATE TRIGGER app_product_bump_catalog_version
+AFTER INSERT OR DELETE OR TRUNCATE OR UPDATE OF
+    category_id,
+    name,
+    description,
+    price,
+    photo,
+    photo_optimized,
+    photo_thumbnail,
+    photo_width,
+    photo_height,
+    photo_hash
+ON app_product
+FOR EACH STATEMENT EXECUTE FUNCTION app_bump_catalog_version();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS app_product_bump_catalog_version ON app_product;
+DROP TRIGGER IF EXISTS app_category_bump_catalog_version ON app_category;
+DROP FUNCTION IF EXISTS app_bump_catalog_version();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0009_query_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
@@ -1,4 +1,9 @@
-from django.db import models
+from app.images import process_product_photo
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Now, Substr
+from django.utils import timezone
 
 
 class Client(models.Model):
@@ -14,8 +19,38 @@ class Client(models.Model):
         return self.username
 
 
+class CategoryLabel(models.Func):
+    """
+    Имя категории с цепочкой предков («Корень → Раздел → Категория»)
+    по её пути: предки читаются по первичному ключу из id в path.
+    """
+
+    template = (
+        "(SELECT string_agg(ancestor.name, ' → ' ORDER BY ancestor.depth) "
+        "FROM app_category ancestor WHERE ancestor.id = "
+        "ANY(string_to_array(btrim(%(expressions)s, '/'), '/')::bigint[]))"
+    )
+    output_field = models.CharField()
+
+
+class CategoryQuerySet(models.QuerySet):
+    def with_labels(self):
+        """Подписи категорий для __str__ без запроса на каждую."""
+        return self.annotate(label=CategoryLabel("path"))
+
+
 class Category(models.Model):
-    """Категории и подкатегории товаров."""
+    """
+    Категории и подкатегории товаров.
+
+    Помимо parent дерево хранится материализованным путём: path — id
+    всех предков и самой категории через «/» («/1/5/12/»), depth —
+    глубина от корня. Поддерево — диапазон path по индексу, цепочка
+    предков — id из path; оба читаются одним запросом. Так же строится
+    подпись категории (__str__, CategoryLabel).
+    Путь обновляет save(), поэтому менять parent через
+    QuerySet.update() нельзя.
+    """
 
     name = models.CharField(max_length=100)
     parent = models.ForeignKey(
@@ -24,32 +59,189 @@ class Category(models.Model):
         blank=True,
         related_name="subcategories",
         on_delete=models.CASCADE,
+        # покрыт индексом app_category_parent_name_idx
+        db_index=False,
     )
+    # побайтовое сравнение (C) — по индексу работают и LIKE 'префикс%',
+    # и диапазон path >= '/1/5/' AND path < '/1/50'
+    path = models.CharField(
+        max_length=255,
+        db_collation="C",
+        editable=False,
+        db_default="",
+    )
+    depth = models.PositiveSmallIntegerField(editable=False, db_default=0)
+
+    objects = CategoryQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Категория"
         verbose_name_plural = "Категории"
+        indexes = [
+            models.Index(fields=("path",), name="app_category_path_idx"),
+            # страница подкатегорий в боте: WHERE parent_id = ?
+            # ORDER BY name, id — index-only scan без сортировки
+            models.Index(
+                fields=("parent", "name", "id"),
+                name="app_category_parent_name_idx",
+            ),
+            # то же для корня: IS NULL не даёт порядка по индексу выше
+            models.Index(
+                fields=("name", "id"),
+                condition=models.Q(parent__isnull=True),
+                name="app_category_root_name_idx",
+            ),
+        ]
 
     def __str__(self):
-        return self.name if not self.parent else f"{self.parent} → {self.name}"
+        label = getattr(self, "label", None)
+        return label if label is not None else self.get_label()
+
+    def get_label(self):
+        """
+        Имя с цепочкой предков. Их id берутся из path, поэтому при
+        любой глубине нужен не больше чем один запрос.
+        """
+
+        ancestor_ids = self.path.strip("/").split("/")[:-1]
+        if not ancestor_ids:
+            return self.name
+        names = (
+            Category.objects.filter(pk__in=ancestor_ids)
+            .order_by("depth")
+            .values_list("name", flat=True)
+        )
+        return " → ".join((*names, self.name))
+
+    def clean(self):
+        # нельзя перенести категорию в саму себя или в своего потомка
+        if self.pk and self.parent_id and self.path:
+            parent_path = (
+                Category.objects.filter(pk=self.parent_id)
+                .values_list("path", flat=True)
+                .first()
+            )
+            if parent_path and parent_path.startswith(self.path):
+                raise ValidationError(
+                    {
+                        "parent": "Категорию нельзя вложить в её же подкатегорию."
+                    }
+                )
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.update_path()
+
+    def update_path(self):
+        """
+        Пересчитывает путь после сохранения. При переносе в другого
+        родителя одним UPDATE переписывает пути всего поддерева.
+        """
+
+        parent_path = "/"
+        if self.parent_id:
+            parent_path = Category.objects.values_list("path", flat=True).get(
+                pk=self.parent_id
+            )
+        path = f"{parent_path}{self.pk}/"
+        depth = path.count("/") - 2
+        if path == self.path:
+            return
+
+        if self.path:
+            old_path = self.path
+            Category.objects.filter(path__startswith=old_path).update(
+                path=Concat(Value(path), Substr("path", len(old_path) + 1)),
+                depth=F("depth") + (depth - self.depth),
+            )
+        else:
+            Category.objects.filter(pk=self.pk).update(path=path, depth=depth)
+        self.path = path
+        self.depth = depth
 
 
 class Product(models.Model):
     category = models.ForeignKey(
-        Category, related_name="products", on_delete=models.CASCADE
+        Category,
+        related_name="products",
+        on_delete=models.CASCADE,
+        # покрыт индексом app_product_category_name_idx
+        db_index=False,
     )
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     photo = models.ImageField(upload_to="shared_media/", blank=True)
+    # версия фото для Telegram и миниатюра, см. app.images
+    photo_optimized = models.ImageField(
+        upload_to="shared_media/optimized/",
+        blank=True,
+        editable=False,
+        db_default="",
+    )
+    photo_thumbnail = models.ImageField(
+        upload_to="shared_media/thumbnails/",
+        blank=True,
+        editable=False,
+        db_default="",
+    )
+    photo_width = models.PositiveIntegerField(
+        null=True, blank=True, editable=False
+    )
+    photo_height = models.PositiveIntegerField(
+        null=True, blank=True, editable=False
+    )
+    # sha256 фото, которое отправляет бот; по нему бот сверяет file_id
+    photo_hash = models.CharField(
+        max_length=64, blank=True, editable=False, db_default=""
+    )
+    # file_id фото в Telegram после первой загрузки ботом
+    telegram_file_id = models.CharField(
+        max_length=255, blank=True, editable=False, db_default=""
+    )
 
     class Meta:
         verbose_name = "Товар"
         verbose_name_plural = "Товары"
+        indexes = [
+            # страница товаров в боте: WHERE category_id = ?
+            # ORDER BY name, id — index-only scan без сортировки
+            models.Index(
+                fields=("category", "name", "id"),
+                name="app_product_category_name_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # новое фото ещё не сохранено в хранилище (_committed=False):
+        # готовим версию для бота и сбрасываем file_id старого фото
+        if self.photo and not self.photo._committed:
+            self.set_processed_photo(process_product_photo(self.photo))
+        elif not self.photo:
+            self.photo_optimized = ""
+            self.photo_thumbnail = ""
+            self.photo_width = None
+            self.photo_height = None
+            self.photo_hash = ""
+            self.telegram_file_id = ""
+        super().save(*args, **kwargs)
+
+    def set_processed_photo(self, processed):
+        self.photo_optimized.save(
+            processed.optimized.name, processed.optimized, save=False
+        )
+        self.photo_thumbnail.save(
+            processed.thumbnail.name, processed.thumbnail, save=False
+        )
+        self.photo_width = processed.width
+        self.photo_height = processed.height
+        self.photo_hash = processed.content_hash
+        self.telegram_file_id = ""
+
 
 class Cart(models.Model):
     """Модель корзины пользователя пользователя."""
@@ -68,7 +260,11 @@ class CartItem(models.Model):
     """Модель товаров в корзине."""
 
     cart = models.ForeignKey(
-        Cart, on_delete=models.CASCADE, related_name="items"
+        Cart,
+        on_delete=models.CASCADE,
+        related_name="items",
+        # покрыт уникальным индексом (cart, product)
+        db_index=False,
     )
     product = models.ForeignKey(
         Product, on_delete=models.CASCADE, related_name="cart_items"
@@ -78,6 +274,14 @@ class CartItem(models.Model):
     class Meta:
         verbose_name = "Товар в корзине"
         verbose_name_plural = "Товары в корзине"
+        constraints = [
+            # на ограничение опирается upsert корзины в боте
+            # (ON CONFLICT (cart_id, product_id))
+            models.UniqueConstraint(
+                fields=("cart", "product"),
+                name="app_cartitem_unique_cart_product",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.product.name}x{self.quantity}"
@@ -107,7 +311,11 @@ class OrderItem(models.Model):
     """Модель товара в составе заказа клиента."""
 
     order = models.ForeignKey(
-        Order, related_name="items", on_delete=models.CASCADE
+        Order,
+        related_name="items",
+        on_delete=models.CASCADE,
+        # покрыт индексом app_orderitem_order_id_idx
+        db_index=False,
     )
     product = models.ForeignKey(Product, on_delete=models.SET_NULL, null=True)
     quantity = models.PositiveIntegerField(default=1)
@@ -116,6 +324,99 @@ class OrderItem(models.Model):
     class Meta:
         verbose_name = "Товар в заказе"
         verbose_name_plural = "Товары в заказе"
+        indexes = [
+            # позиции заказа в порядке добавления без сортировки
+            models.Index(
+                fields=("order", "id"), name="app_orderitem_order_id_idx"
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.product.name}x{self.quantity}"
+        # товар мог быть удалён (SET_NULL)
+        name = self.product.name if self.product else "—"
+        return f"{name}x{self.quantity}"
+
+
+class CatalogVersion(models.Model):
+    """
+    Версия каталога (единственная строка).
+
+    Увеличивается при любом изменении категорий и товаров, бот по ней
+    решает, пора ли перечитать каталог. Поднимают её триггеры в БД
+    (миграция 0010), поэтому учитываются и QuerySet.update(), и
+    bulk-операции, и изменения SQL в обход Django.
+    """
+
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Версия каталога"
+        verbose_name_plural = "Версия каталога"
+
+    def __str__(self):
+        return f"v{self.version}"
+
+
+class Faq(models.Model):
+    """Вопрос и ответ для inline-поиска FAQ в боте."""
+
+    question = models.CharField(max_length=255)
+    answer = models.TextField()
+    position = models.PositiveIntegerField(default=0, db_default=0)
+    is_active = models.BooleanField(default=True, db_default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Вопрос FAQ"
+        verbose_name_plural = "FAQ"
+        ordering = ("position", "id")
+
+    def __str__(self):
+        return self.question
+
+
+class OutboxEvent(models.Model):
+    """
+    Событие для фоновой обработки ботом (transactional outbox).
+
+    Записывается в одной транзакции с заказом, по строке на каждого
+    получателя (выгрузка, уведомление админов и т.п.).
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Ожидает"
+        DONE = "done", "Обработано"
+        FAILED = "failed", "Ошибка"
+
+    event_type = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict)
+    # тип события и id объекта; получатели по нему отсекают повторы
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        db_default=Status.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0, db_default=0)
+    # не раньше этого времени событие берётся в обработку
+    available_at = models.DateTimeField(default=timezone.now, db_default=Now())
+    created_at = models.DateTimeField(auto_now_add=True, db_default=Now())
+    processed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, db_default="")
+
+    class Meta:
+        verbose_name = "Событие outbox"
+        verbose_name_plural = "Outbox"
+        indexes = [
+            # выборка воркера: ORDER BY available_at, id
+            models.Index(
+                fields=("available_at", "id"),
+                condition=models.Q(status="pending"),
+                name="app_outbox_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return self.idempotency_key
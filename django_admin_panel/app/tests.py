@@ -1,3 +1,221 @@
+from decimal import Decimal
+from urllib.parse import urlencode
+
+from app.models import (
+    CatalogVersion,
+    Category,
+    Client,
+    Order,
+    OrderItem,
+    Product,
+)
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+class AdminChangelistQueriesTests(TestCase):
+    """
+    Число запросов на страницу списка в админке не зависит
+    от числа строк на ней.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "", "password")
+        cls.client_obj = Client.objects.create(telegram_id=1, username="one")
+        root = Category.objects.create(name="Корень")
+        section = Category.objects.create(name="Раздел", parent=root)
+        # категории товаров на глубине 3: подпись не должна обходить parent
+        cls.group = Category.objects.create(name="Группа", parent=section)
+        cls.add_rows(3)
+
+    @classmethod
+    def add_rows(cls, count):
+        for _ in range(count):
+            category = Category.objects.create(name="Лист", parent=cls.group)
+            product = Product.objects.create(
+                category=category, name="Товар", price=Decimal("10.00")
+            )
+            order = Order.objects.create(
+                client=cls.client_obj, address="адрес", total_price=20
+            )
+            OrderItem.objects.create(
+                order=order, product=product, quantity=2, price=10
+            )
+            # позиция с удалённым товаром
+            OrderItem.objects.create(order=order, product=None, price=5)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assert_constant_queries(self, url):
+        expected = self.count_queries(url)
+        self.add_rows(10)
+        with self.assertNumQueries(expected):
+            self.client.get(url)
+
+    def test_category_changelist(self):
+        self.assert_constant_queries(reverse("admin:app_category_changelist"))
+
+    def test_product_changelist(self):
+        self.assert_constant_queries(reverse("admin:app_product_changelist"))
+
+    def test_order_changelist(self):
+        self.assert_constant_queries(reverse("admin:app_order_changelist"))
+
+    def test_orderitem_changelist(self):
+        self.assert_constant_queries(reverse("admin:app_orderitem_changelist"))
+
+    def test_product_changelist_category_label(self):
+        response = self.client.get(reverse("admin:app_product_changelist"))
+        self.assertContains(response, "Корень → Раздел → Группа → Лист")
+
+    def test_category_autocomplete(self):
+        url = reverse("admin:autocomplete")
+        params = {
+            "app_label": "app",
+            "model_name": "product",
+            "field_name": "category",
+        }
+        expected = self.count_queries(f"{url}?{urlencode(params)}")
+        self.add_rows(10)
+        with self.assertNumQueries(expected):
+            response = self.client.get(url, params)
+        self.assertIn(
+            "Корень → Раздел → Группа → Лист",
+            [result["text"] for result in response.json()["results"]],
+        )
+
+    def test_order_changelist_totals(self):
+        response = self.client.get(reverse("admin:app_order_changelist"))
+        order = response.context["cl"].result_list[0]
+        self.assertEqual(order.items_count, 2)
+        self.assertEqual(order.items_total, Decimal("25.00"))
+
+
+class CatalogVersionTriggerTests(TestCase):
+    """Версию каталога поднимают триггеры БД, в том числе на bulk-операции."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Раздел")
+
+    def get_version(self):
+        return (
+            CatalogVersion.objects.filter(pk=1)
+            .values_list("version", flat=True)
+            .first()
+            or 0
+        )
+
+    def assert_bumped(self, operation):
+        before = self.get_version()
+        operation()
+        self.assertGreater(self.get_version(), before)
+
+    def test_bulk_create(self):
+        self.assert_bumped(
+            lambda: Product.objects.bulk_create(
+                [Product(category=self.category, name="Товар", price=1)]
+            )
+        )
+
+    def test_queryset_update(self):
+        self.assert_bumped(
+            lambda: Category.objects.filter(pk=self.category.pk).update(
+                name="Другой раздел"
+            )
+        )
+
+    def test_queryset_delete(self):
+        Product.objects.create(category=self.category, name="Товар", price=1)
+        self.assert_bumped(lambda: Product.objects.all().delete())
+
+    def test_telegram_file_id_update_keeps_version(self):
+        product = Product.objects.create(
+            category=self.category, name="Товар", price=1
+        )
+        before = self.get_version()
+        Product.objects.filter(pk=product.pk).update(telegram_file_id="id")
+        self.assertEqual(self.get_version(), before)
+
+
+class OrderExportTests(TestCase):
+    """Выгрузка заказов не тянет аннотации списка заказов."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "", "password")
+        client = Client.objects.create(telegram_id=1, username="one")
+        category = Category.objects.create(name="Раздел")
+        product = Product.objects.create(
+            category=category, name="Товар", price=Decimal("10.00")
+        )
+        order = Order.objects.create(
+            client=client, address="адрес", total_price=20
+        )
+        OrderItem.objects.create(
+            order=order, product=product, quantity=2, price=10
+        )
+
+    def test_csv_export(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("admin:app_order_export"), {"format": "csv"}
+            )
+            content = b"".join(response.streaming_content).decode()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Товар (x2) — 10.00₽", content)
+        for query in queries:
+            self.assertNotIn("GROUP BY", query["sql"])
+
+
+class CategoryLabelTests(TestCase):
+    """Подпись категории строится по path, а не обходом parent."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.root = Category.objects.create(name="Корень")
+        cls.section = Category.objects.create(name="Раздел", parent=cls.root)
+        cls.group = Category.objects.create(name="Группа", parent=cls.section)
+        cls.leaf = Category.objects.create(name="Лист", parent=cls.group)
+
+    def test_str_single_query(self):
+        leaf = Category.objects.get(pk=self.leaf.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(str(leaf), "Корень → Раздел → Группа → Лист")
+        with self.assertNumQueries(0):
+            self.assertEqual(str(self.root), "Корень")
+
+    def test_with_labels(self):
+        with self.assertNumQueries(1):
+            labels = [
+                str(category)
+                for category in Category.objects.with_labels().order_by("path")
+            ]
+        self.assertEqual(
+            labels,
+            [
+                "Корень",
+                "Корень → Раздел",
+                "Корень → Раздел → Группа",
+                "Корень → Раздел → Группа → Лист",
+            ],
+        )
 
-# Create your tests here.
+    def test_label_after_move(self):
+        self.group.parent = self.root
+        self.group.save()
+        leaf = Category.objects.with_labels().get(pk=self.leaf.pk)
+        self.assertEqual(str(leaf), "Корень → Группа → Лист")
+        self.assertEqual(leaf.get_label(), "Корень → Группа → Лист")
@@ -0,0 +1,98 @@
+"""
+Микробенчмарк маршрутизации callback_query: обычная цепочка роутеров
+против индекса handlers.callback_index.
+
+Обработчики бота копируются в зеркальное дерево роутеров с теми же
+фильтрами и пустыми callback, поэтому замеряется только маршрутизация.
+Запуск из каталога telegram_bot с заполненным .env:
+
+    python -m benchmarks.callback_routing
+"""
+
+import asyncio
+import time
+
+from aiogram import Dispatcher, Router
+from aiogram.types import CallbackQuery, User
+from filters import (
+    AddToCartFilter,
+    CategoryFilter,
+    ConfirmAddToCartFilter,
+    ProductFilter,
+    RemoveFromCartFilter,
+)
+from handlers import get_handlers_router
+from handlers.callback_index import IndexedRouter
+
+ROUNDS = 20_000
+
+CALLBACKS = {
+    "main menu": "show_main_menu",
+    "category page": CategoryFilter(id=12, page=2).pack(),
+    "product": ProductFilter(id=123456, page=1, parent_id=42).pack(),
+    "add to cart": AddToCartFilter(id=123456).pack(),
+    "confirm": ConfirmAddToCartFilter(id=123456, quantity=2).pack(),
+    "remove cart": RemoveFromCartFilter(user_id=123456789).pack(),
+    "check subscription": "check_subscription_to_channels",
+    "unknown": "stale:button",
+}
+
+
+async def noop(*args, **kwargs) -> None:
+    return None
+
+
+def mirror(source: Router, root: type = Router) -> Router:
+    """Копия роутера: те же фильтры callback_query, пустые обработчики."""
+
+    router = root(name=source.name)
+    for handler in source.callback_query.handlers:
+        router.callback_query.register(
+            noop,
+            *(
+                filter_object.magic or filter_object.callback
+                for filter_object in handler.filters
+            ),
+            flags=handler.flags,
+        )
+    for sub_router in source.sub_routers:
+        router.include_router(mirror(sub_router))
+    return router
+
+
+def make_dispatcher(handlers_router: Router, indexed: bool) -> Dispatcher:
+    dp = Dispatcher()
+    if indexed:
+        router = mirror(handlers_router, IndexedRouter)
+        router.build_index()
+    else:
+        router = mirror(handlers_router)
+    dp.include_router(router)
+    return dp
+
+
+async def measure(dp: Dispatcher, event: CallbackQuery) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        await dp.propagate_event("callback_query", event)
+    return (time.perf_counter() - started) / ROUNDS * 1_000_000
+
+
+async def main() -> None:
+    user = User(id=1, is_bot=False, first_name="bench")
+    handlers_router = get_handlers_router()
+    chain = make_dispatcher(handlers_router, indexed=False)
+    index = make_dispatcher(handlers_router, indexed=True)
+
+    print(f"{'callback':<20}{'chain, µs':>12}{'index, µs':>12}")
+    for name, data in CALLBACKS.items():
+        event = CallbackQuery(
+            id="1", from_user=user, chat_instance="bench", data=data
+        )
+        chain_time = await measure(chain, event)
+        index_time = await measure(index, event)
+        print(f"{name:<20}{chain_time:>12.2f}{index_time:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,242 @@
+"""
+Проверка планов запросов database/db.py по индексам админки.
+
+Каждая функция БД вызывается на тестовых данных внутри транзакции,
+которая в конце откатывается. Её SQL перехватывается и прогоняется
+через EXPLAIN с enable_seqscan и enable_sort = off: так планировщик
+берёт индекс всегда, когда он подходит, независимо от объёма данных,
+и Seq Scan или Sort в плане означают, что подходящего индекса нет.
+Запуск из каталога telegram_bot с заполненным .env на базе с
+применёнными миграциями админки:
+
+    python -m benchmarks.query_plans
+
+Код возврата 1, если какой-то запрос не прошёл проверку.
+"""
+
+import asyncio
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+from aiogram.types import ShippingAddress
+from database import db
+from database.engine import engine
+from database.models import Category, Client, OutboxEvent, Product
+from sqlalchemy import event, func, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+TELEGRAM_ID = 2_000_000_001
+
+FORBIDDEN_NODES = ("Seq Scan", "Sort", "Incremental Sort")
+
+# узлы, допустимые для функции, и почему
+ALLOWED_NODES: Dict[str, Tuple[str, ...]] = {
+    # полная выгрузка каталога для снимка раз в CATALOG_REFRESH_INTERVAL
+    "get_all_categories": ("Seq Scan", "Sort"),
+    "get_all_products": ("Seq Scan", "Sort"),
+    # таблицы FAQ и версии каталога — десятки строк, читаются целиком
+    "get_faq_fingerprint": ("Seq Scan",),
+    "get_all_faqs": ("Seq Scan", "Sort"),
+    "get_catalog_version": ("Seq Scan",),
+    # товары нескольких подкатегорий сливаются и сортируются по имени
+    "get_subtree_products": ("Sort",),
+    # предки по id из пути сортируются по глубине: строк не больше глубины
+    "get_category_breadcrumbs": ("Sort",),
+}
+
+ADDRESS = ShippingAddress(
+    country_code="RU",
+    state="",
+    city="Москва",
+    street_line1="Тверская, 1",
+    street_line2="",
+    post_code="101000",
+)
+
+
+class StatementRecorder:
+    """Запоминает SQL и параметры, отправленные в соединение."""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, Any]] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, many):
+        if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE")):
+            self.statements.append((statement, parameters))
+
+
+def iter_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from iter_nodes(child)
+
+
+async def create_fixture(session: AsyncSession) -> Dict[str, int]:
+    """Клиент, категория с подкатегорией и товар для вызовов функций."""
+
+    client = Client(telegram_id=TELEGRAM_ID, username="query_plans")
+    category = Category(name="query_plans")
+    session.add_all((client, category))
+    await session.flush()
+    subcategory = Category(name="query_plans", parent_id=category.id)
+    session.add(subcategory)
+    await session.flush()
+    category.path = f"/{category.id}/"
+    subcategory.path = f"/{category.id}/{subcategory.id}/"
+    subcategory.depth = 1
+    product = Product(
+        category_id=subcategory.id,
+        name="query_plans",
+        description="",
+        price=1,
+        photo="",
+    )
+    session.add(product)
+    await session.flush()
+    return {
+        "category_id": category.id,
+        "subcategory_id": subcategory.id,
+        "product_id": product.id,
+    }
+
+
+def get_calls(ids: Dict[str, int]):
+    """Функции database/db.py с аргументами, в порядке сценария бота."""
+
+    category_id = ids["category_id"]
+    subcategory_id = ids["subcategory_id"]
+    product_id = ids["product_id"]
+    return (
+        ("get_or_create_user", (TELEGRAM_ID, "query_plans")),
+        ("get_catalog_version", ()),
+        ("get_faq_fingerprint", ()),
+        ("get_all_faqs", ()),
+        ("get_all_categories", ()),
+        ("get_all_products", ()),
+        ("get_categories_page", (None, 1, 10)),
+        ("get_categories_page", (category_id, 1, 10)),
+        ("get_products_page", (subcategory_id, 1, 10)),
+        ("get_category_subtree", (category_id,)),
+        ("get_category_breadcrumbs", (subcategory_id,)),
+        ("get_subtree_products", (category_id,)),
+        ("get_product", (product_id,)),
+        ("set_product_photo_file_id", (product_id, "", "file_id")),
+        ("add_to_cart", (TELEGRAM_ID, product_id, 1)),
+        ("get_cart_items", (TELEGRAM_ID,)),
+        ("get_cart_total", (TELEGRAM_ID,)),
+        ("create_order_from_cart", (TELEGRAM_ID, ADDRESS, "query_plans")),
+        ("get_order_items", (None,)),
+        ("claim_outbox_events", (10, 60)),
+        ("fail_outbox_event", (None, "error", 60)),
+        ("complete_outbox_event", (None,)),
+        ("add_to_cart", (TELEGRAM_ID, product_id, 1)),
+        ("clear_cart_items", (TELEGRAM_ID,)),
+    )
+
+
+async def call(name: str, args: tuple, session: AsyncSession, state: dict):
+    function = getattr(db, name)
+    if name == "create_order_from_cart":
+        telegram_id, address, event_type = args
+        items = await function(
+            telegram_id, address, session, outbox_events=(event_type,)
+        )
+        state["order_id"] = items[0].order_id
+        # db_default Now() — время оператора, оно позже now() транзакции,
+        # в которой событие забирается
+        await session.execute(
+            update(OutboxEvent)
+            .where(
+                OutboxEvent.idempotency_key
+                == f"{event_type}:{state['order_id']}"
+            )
+            .values(available_at=func.now())
+        )
+    elif name == "get_order_items":
+        await function(state["order_id"], session)
+    elif name == "claim_outbox_events":
+        events = await function(*args, session)
+        state["event_id"] = events[0].id
+    elif name in ("fail_outbox_event", "complete_outbox_event"):
+        await function(state["event_id"], *args[1:], session)
+    else:
+        await function(*args, session)
+
+
+async def explain(
+    connection: AsyncConnection, statement: str, parameters: Any
+) -> List[str]:
+    """Запрещённые узлы плана запроса."""
+
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    found = []
+    for node in iter_nodes(plan[0]["Plan"]):
+        if node["Node Type"] in FORBIDDEN_NODES:
+            relation = node.get("Relation Name")
+            found.append(
+                f"{node['Node Type']} on {relation}"
+                if relation
+                else node["Node Type"]
+            )
+    return found
+
+
+async def main() -> int:
+    recorder = StatementRecorder()
+    failures = 0
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        await connection.execute(text("SET LOCAL enable_seqscan = off"))
+        await connection.execute(text("SET LOCAL enable_sort = off"))
+        # commit внутри функций превращается в RELEASE SAVEPOINT
+        session = AsyncSession(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False,
+        )
+        ids = await create_fixture(session)
+        state: Dict[str, int] = {}
+
+        for name, args in get_calls(ids):
+            # функции, открывающие session.begin(), ждут сессию без
+            # начатой транзакции, как в обработчиках бота
+            await session.commit()
+            db.client_ids.clear()
+            recorder.statements.clear()
+            event.listen(engine.sync_engine, "before_cursor_execute", recorder)
+            try:
+                await call(name, args, session, state)
+            finally:
+                event.remove(
+                    engine.sync_engine, "before_cursor_execute", recorder
+                )
+
+            allowed = ALLOWED_NODES.get(name, ())
+            for statement, parameters in recorder.statements:
+                found = await explain(connection, statement, parameters)
+                bad = [
+                    node
+                    for node in found
+                    if node.split(" on ")[0] not in allowed
+                ]
+                status = "FAIL" if bad else "ok"
+                failures += bool(bad)
+                summary = ", ".join(found) or "по индексам"
+                print(f"{status:4} {name}: {summary}")
+
+        await session.close()
+        await transaction.rollback()
+
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
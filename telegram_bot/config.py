@@ -22,6 +22,45 @@ GROUP_URL = os.getenv("GROUP_URL")
 YOO_TOKEN = os.getenv("YOO_TOKEN")  # токен YooKassa
 LOG_FILE_PATH = os.getenv("LOG_FILE", "logs/telegram_bot.log")
 EXCEL_FILE = "orders_data/orders.xlsx"
+# журнал оплаченных заказов (JSON Lines), из него строится EXCEL_FILE
+ORDERS_JOURNAL_FILE = "orders_data/orders.jsonl"
+# период пересборки EXCEL_FILE из журнала, секунды
+ORDERS_EXPORT_INTERVAL = float(os.getenv("ORDERS_EXPORT_INTERVAL", 300))
+# чат для уведомлений о новых заказах; если не задан, уведомлений нет
+ADMIN_CHAT_ID = int(os.getenv("ADMIN_CHAT_ID", 0)) or None
+# период опроса outbox, если воркер не разбудили раньше, секунды
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 5))
+# пул соединений с БД
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(
+    os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", 100)
+)
+# statement_timeout в миллисекундах, 0 — без ограничения
+DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", 0))
+# подключение через PgBouncer в режиме transaction
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+# период записи метрик пула в лог, секунды
+DB_POOL_METRICS_INTERVAL = float(os.getenv("DB_POOL_METRICS_INTERVAL", 60))
+# период проверки версии каталога в БД, секунды
+CATALOG_REFRESH_INTERVAL = float(os.getenv("CATALOG_REFRESH_INTERVAL", 30))
+# период проверки изменений FAQ в БД, секунды
+FAQ_REFRESH_INTERVAL = float(os.getenv("FAQ_REFRESH_INTERVAL", 60))
+# режим получения обновлений: polling или webhook
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+# публичный https-адрес бота; если не задан, setWebhook не вызывается
+# (удобно для локальной отправки записанных обновлений)
+WEBHOOK_BASE_URL = os.getenv("WEBHOOK_BASE_URL")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+# заголовок X-Telegram-Bot-Api-Secret-Token, символы A-Z, a-z, 0-9, _ и -
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", 8080))
+# сколько обновлений обрабатывается одновременно
+UPDATES_CONCURRENCY = int(os.getenv("UPDATES_CONCURRENCY", 100))
 DB_URL = f"postgresql+asyncpg://{os.getenv("POSTGRES_USER")}:{os.getenv("POSTGRES_PASSWORD")}@{os.getenv("DB_HOST")}:{os.getenv("DB_PORT")}/{os.getenv("DB_NAME")}"
 
 logging.basicConfig(
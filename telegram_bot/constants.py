@@ -1,2 +1,40 @@
 DATETIME_FORMAT = "%H:%M:%S_%d.%m.%Y"
 BUTTONS_PER_PAGE = 3
+# готовые клавиатуры страниц каталога
+CATALOG_KEYBOARD_CACHE_SIZE = 2_000
+# кэш соответствия telegram_id -> id клиента в БД
+CLIENT_ID_CACHE_SIZE = 100_000
+CLIENT_ID_CACHE_TTL = 60 * 60
+# file_id фото товаров, загруженных с момента последнего снимка каталога
+PHOTO_FILE_ID_CACHE_SIZE = 10_000
+# на ответ pre_checkout_query у Telegram 10 секунд, оставляем запас
+PRE_CHECKOUT_TIMEOUT = 5
+# кэш результатов getChatMember для проверки подписки
+SUBSCRIPTION_CACHE_SIZE = 100_000
+SUBSCRIPTION_CACHE_TTL = 5 * 60
+# лимиты исходящих запросов к Telegram Bot API (сообщений в секунду)
+TELEGRAM_GLOBAL_RATE = 30
+TELEGRAM_PRIVATE_CHAT_RATE = 1
+TELEGRAM_PRIVATE_CHAT_BURST = 3
+TELEGRAM_GROUP_CHAT_RATE = 20 / 60
+TELEGRAM_GROUP_CHAT_BURST = 3
+# доля глобального лимита, недоступная массовым рассылкам
+TELEGRAM_BULK_RESERVE = 0.3
+TELEGRAM_RETRY_ATTEMPTS = 3
+TELEGRAM_CHAT_BUCKETS_SIZE = 10_000
+# ссылки на оплату для неизменённых корзин
+INVOICE_LINK_CACHE_SIZE = 10_000
+INVOICE_LINK_TTL = 60 * 60
+# inline-поиск по FAQ
+FAQ_MAX_RESULTS = 50
+FAQ_MAX_PREFIX_LENGTH = 20
+FAQ_INLINE_CACHE_TIME = 300
+# пакетная запись журнала заказов: не чаще раза в интервал или по размеру
+ORDER_JOURNAL_FLUSH_INTERVAL = 0.05
+ORDER_JOURNAL_BATCH_SIZE = 100
+# обработка событий outbox: размер пачки, аренда события и повторы, секунды
+OUTBOX_BATCH_SIZE = 20
+OUTBOX_LEASE = 5 * 60
+OUTBOX_MAX_ATTEMPTS = 10
+OUTBOX_RETRY_BASE = 5
+OUTBOX_RETRY_MAX = 60 * 60
@@ -1,23 +1,49 @@
 from .db import (
     get_or_create_user,
-    get_categories,
-    get_subcategories,
-    get_products,
+    get_catalog_version,
+    get_faq_fingerprint,
+    get_all_faqs,
+    get_all_categories,
+    get_all_products,
+    get_category_subtree,
+    get_category_breadcrumbs,
+    get_subtree_products,
+    get_categories_page,
+    get_products_page,
     get_product,
+    set_product_photo_file_id,
     add_to_cart,
     get_cart_items,
+    get_cart_total,
     clear_cart_items,
     create_order_from_cart,
+    get_order_items,
+    claim_outbox_events,
+    complete_outbox_event,
+    fail_outbox_event,
 )
 
 __all__ = (
     "get_or_create_user",
-    "get_categories",
-    "get_subcategories",
-    "get_products",
+    "get_catalog_version",
+    "get_faq_fingerprint",
+    "get_all_faqs",
+    "get_all_categories",
+    "get_all_products",
+    "get_category_subtree",
+    "get_category_breadcrumbs",
+    "get_subtree_products",
+    "get_categories_page",
+    "get_products_page",
     "get_product",
+    "set_product_photo_file_id",
     "add_to_cart",
     "get_cart_items",
+    "get_cart_total",
     "clear_cart_items",
     "create_order_from_cart",
+    "get_order_items",
+    "claim_outbox_events",
+    "complete_outbox_event",
+    "fail_outbox_event",
 )
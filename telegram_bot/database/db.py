@@ -1,11 +1,31 @@
-from aiocache import cached
-from sqlalchemy import select
+from sqlalchemy import (
+    BigInteger,
+    Row,
+    String,
+    any_,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    literal,
+    select,
+    true,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from datetime import datetime, timezone
-from typing import List, Optional
+from sqlalchemy.orm import aliased, contains_eager, selectinload
+from datetime import timedelta
+from decimal import Decimal
+from typing import List, Optional, Sequence, Tuple
 from config import logger
+from constants import CLIENT_ID_CACHE_SIZE, CLIENT_ID_CACHE_TTL
 from database.models import (
+    CatalogVersion,
+    Faq,
     Client,
     Category,
     Product,
@@ -13,18 +33,43 @@ from database.models import (
     Cart,
     Order,
     OrderItem,
+    OutboxEvent,
 )
 from aiogram.types import ShippingAddress
+from utils import LRUCache
+
+# id клиента неизменен, поэтому соответствие telegram_id -> id кэшируется;
+# TTL нужен на случай удаления клиента из админки
+client_ids = LRUCache(maxsize=CLIENT_ID_CACHE_SIZE, ttl=CLIENT_ID_CACHE_TTL)
+
+# поля товара в порядке services.catalog.ProductRecord;
+# бот отправляет подготовленную админкой версию фото, если она есть
+PRODUCT_COLUMNS = (
+    Product.id,
+    Product.category_id,
+    Product.name,
+    Product.description,
+    Product.price,
+    func.coalesce(
+        func.nullif(Product.photo_optimized, ""), Product.photo
+    ).label("photo"),
+    Product.photo_hash,
+    Product.telegram_file_id,
+)
 
 
-async def get_client_by_telegram_id(
+async def get_client_id(
     telegram_id: int, session: AsyncSession
-) -> Optional[Client]:
-    """Функция для получения клиента по telegram_id."""
-    result = await session.execute(
-        select(Client).where(Client.telegram_id == telegram_id)
-    )
-    return result.scalar_one_or_none()
+) -> Optional[int]:
+    """Функция для получения id клиента по telegram_id (через кэш)."""
+    client_id = client_ids.get(telegram_id)
+    if client_id is None:
+        client_id = await session.scalar(
+            select(Client.id).where(Client.telegram_id == telegram_id)
+        )
+        if client_id is not None:
+            client_ids.set(telegram_id, client_id)
+    return client_id
 
 
 async def get_cart_by_client_id(
@@ -44,73 +89,222 @@ async def get_cart_by_client_id(
 async def get_or_create_user(
     telegram_id: int, username: str, session: AsyncSession
 ) -> Client:
-    stmt = select(Client).where(Client.telegram_id == telegram_id)
-    result = await session.execute(stmt)
-    user = result.scalar_one_or_none()
-
-    if user:
-        if user.username != username:
-            user.username = username
-            await session.commit()
-            await session.refresh(user)
-        return user
+    """
+    Функция регистрации клиента одним запросом.
 
-    new_user = Client(
+    INSERT ... ON CONFLICT (telegram_id) обновляет username, только если
+    он изменился; если строка не менялась, клиент берётся
+    из существующей записи в том же запросе.
+    """
+    client_insert = insert(Client).values(
         telegram_id=telegram_id,
         username=username,
-        created_at=datetime.now(timezone.utc),
+        created_at=func.now(),
     )
-    session.add(new_user)
+    upserted = (
+        client_insert.on_conflict_do_update(
+            index_elements=[Client.telegram_id],
+            set_={"username": client_insert.excluded.username},
+            where=Client.username.is_distinct_from(
+                client_insert.excluded.username
+            ),
+        )
+        .returning(*Client.__table__.c)
+        .cte("upserted")
+    )
+    existing = select(*Client.__table__.c).where(
+        Client.telegram_id == telegram_id,
+        ~exists(select(upserted.c.id)),
+    )
+    client = aliased(Client, union_all(select(upserted), existing).subquery())
+
+    user = await session.scalar(select(client))
+    if user is None:
+        # параллельный /start вставил клиента после снимка нашего запроса
+        user = await session.scalar(
+            select(Client).where(Client.telegram_id == telegram_id)
+        )
     await session.commit()
-    await session.refresh(new_user)
-    return new_user
 
+    client_ids.set(telegram_id, user.id)
+    return user
 
-@cached(ttl=120)
-async def get_categories(session: AsyncSession) -> List[Category]:
-    stmt = (
-        select(Category)
-        .where(Category.parent_id.is_(None))
-        .order_by(Category.name)
-        .options(selectinload(Category.subcategories))
+
+async def get_catalog_version(session: AsyncSession) -> int:
+    """Функция для получения текущей версии каталога."""
+    return await session.scalar(
+        select(func.coalesce(func.max(CatalogVersion.version), 0))
     )
-    result = await session.execute(stmt)
-    return result.scalars().all()
 
 
-@cached(ttl=120)
-async def get_subcategories(
+async def get_faq_fingerprint(session: AsyncSession) -> Tuple:
+    """
+    Функция для получения отпечатка таблицы FAQ: число записей и время
+    последнего изменения. Меняется при любом добавлении, правке и удалении.
+    """
+    result = await session.execute(
+        select(func.count(Faq.id), func.max(Faq.updated_at))
+    )
+    return tuple(result.one())
+
+
+async def get_all_faqs(session: AsyncSession) -> Sequence[Row]:
+    """Функция для выгрузки опубликованных вопросов FAQ по порядку."""
+    result = await session.execute(
+        select(Faq.id, Faq.question, Faq.answer)
+        .where(Faq.is_active.is_(True))
+        .order_by(Faq.position, Faq.id)
+    )
+    return result.all()
+
+
+async def get_all_categories(session: AsyncSession) -> Sequence[Row]:
+    """Функция для выгрузки всех категорий, отсортированных по имени."""
+    result = await session.execute(
+        select(Category.id, Category.name, Category.parent_id).order_by(
+            Category.name, Category.id
+        )
+    )
+    return result.all()
+
+
+def _in_subtree(category, root):
+    """
+    Условие «category лежит в поддереве root (включая сам root)».
+
+    Пути потомков начинаются с пути root и при побайтовом сравнении
+    лежат в [«/1/5/», «/1/50»), поэтому это диапазон по индексу path.
+    """
+    return (category.path >= root.path) & (
+        category.path < func.left(root.path, -1) + "0"
+    )
+
+
+async def get_category_subtree(
+    category_id: int, session: AsyncSession
+) -> Sequence[Row]:
+    """
+    Функция для получения категории и всех её потомков одним запросом,
+    в порядке обхода дерева в глубину.
+    """
+    root = aliased(Category)
+    result = await session.execute(
+        select(Category.id, Category.name, Category.parent_id)
+        .join(root, _in_subtree(Category, root))
+        .where(root.id == category_id)
+        .order_by(Category.path)
+    )
+    return result.all()
+
+
+async def get_category_breadcrumbs(
     category_id: int, session: AsyncSession
-) -> List[Category]:
+) -> Sequence[Row]:
+    """
+    Функция для получения цепочки категорий от корня до заданной
+    одним запросом: id предков берутся из её пути.
+    """
+    category = aliased(Category)
+    ancestor_ids = cast(
+        func.string_to_array(func.btrim(category.path, "/"), "/"),
+        ARRAY(BigInteger),
+    )
+    result = await session.execute(
+        select(Category.id, Category.name, Category.parent_id)
+        .join(category, Category.id == any_(ancestor_ids))
+        .where(category.id == category_id)
+        .order_by(Category.depth)
+    )
+    return result.all()
+
+
+async def get_subtree_products(
+    category_id: int, session: AsyncSession
+) -> Sequence[Row]:
+    """
+    Функция для получения всех товаров категории и её подкатегорий
+    любой глубины одним запросом, отсортированных по имени.
+    """
+    root = aliased(Category)
+    result = await session.execute(
+        select(*PRODUCT_COLUMNS)
+        .join(Product.category)
+        .join(root, _in_subtree(Category, root))
+        .where(root.id == category_id)
+        .order_by(Product.name, Product.id)
+    )
+    return result.all()
+
+
+async def get_all_products(session: AsyncSession) -> Sequence[Row]:
+    """Функция для выгрузки всех товаров, отсортированных по имени."""
+    result = await session.execute(
+        select(*PRODUCT_COLUMNS).order_by(Product.name, Product.id)
+    )
+    return result.all()
+
+
+async def get_categories_page(
+    parent_id: Optional[int], page: int, per_page: int, session: AsyncSession
+) -> Tuple[Sequence[Row], int]:
+    """
+    Функция для получения страницы категорий (parent_id=None)
+    или подкатегорий и общего их числа одним запросом.
+    """
     stmt = (
-        select(Category)
-        .where(Category.parent_id == category_id)
-        .order_by(Category.name)
+        select(Category.id, Category.name, func.count().over().label("total"))
+        .where(
+            Category.parent_id.is_(None)
+            if parent_id is None
+            else Category.parent_id == parent_id
+        )
+        .order_by(Category.name, Category.id)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
     )
-    result = await session.execute(stmt)
-    return result.scalars().all()
+    rows = (await session.execute(stmt)).all()
+    return rows, rows[0].total if rows else 0
 
 
-@cached(ttl=120)
-async def get_products(
-    subcategory_id: int, session: AsyncSession
-) -> List[Product]:
+async def get_products_page(
+    subcategory_id: int, page: int, per_page: int, session: AsyncSession
+) -> Tuple[Sequence[Row], int]:
+    """
+    Функция для получения страницы товаров подкатегории
+    и общего их числа одним запросом.
+    """
     stmt = (
-        select(Product)
+        select(Product.id, Product.name, func.count().over().label("total"))
         .where(Product.category_id == subcategory_id)
-        .order_by(Product.name)
+        .order_by(Product.name, Product.id)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
     )
-    result = await session.execute(stmt)
-    return result.scalars().all()
+    rows = (await session.execute(stmt)).all()
+    return rows, rows[0].total if rows else 0
 
 
-@cached(ttl=120)
-async def get_product(
-    product_id: int, session: AsyncSession
-) -> Optional[Product]:
-    stmt = select(Product).where(Product.id == product_id)
-    result = await session.execute(stmt)
-    return result.scalars().first()
+async def get_product(product_id: int, session: AsyncSession) -> Optional[Row]:
+    """Функция для получения товара по id."""
+    result = await session.execute(
+        select(*PRODUCT_COLUMNS).where(Product.id == product_id)
+    )
+    return result.first()
+
+
+async def set_product_photo_file_id(
+    product_id: int, photo_hash: str, file_id: str, session: AsyncSession
+) -> None:
+    """
+    Функция сохранения file_id фото товара.
+    Если фото успели сменить в админке (другой хэш), file_id не пишется.
+    """
+    async with session.begin():
+        await session.execute(
+            update(Product)
+            .where(Product.id == product_id, Product.photo_hash == photo_hash)
+            .values(telegram_file_id=file_id)
+        )
 
 
 async def add_to_cart(
@@ -119,58 +313,64 @@ async def add_to_cart(
     quantity: int,
     session: AsyncSession,
 ) -> CartItem:
-    async with session.begin():
-        client = await get_client_by_telegram_id(telegram_id, session)
-        if not client:
-            raise ValueError(f"Клиент с telegram_id={telegram_id} не найден")
+    """
+    Функция добавления товара в корзину за один запрос.
 
-        cart = await session.scalar(
-            select(Cart).where(Cart.client_id == client.id)
+    Корзина клиента создаётся при необходимости (ON CONFLICT по client_id),
+    позиция вставляется или её количество увеличивается
+    (ON CONFLICT по cart_id, product_id). Возвращает итоговую позицию.
+    """
+    cart_insert = insert(Cart).from_select(
+        ["client_id", "created_at"],
+        select(Client.id, func.now()).where(Client.telegram_id == telegram_id),
+    )
+    # DO UPDATE вместо DO NOTHING, чтобы RETURNING отдал id
+    # уже существующей корзины
+    cart_cte = (
+        cart_insert.on_conflict_do_update(
+            index_elements=[Cart.client_id],
+            set_={"client_id": cart_insert.excluded.client_id},
         )
-        if not cart:
-            cart = Cart(
-                client_id=client.id, created_at=datetime.now(timezone.utc)
-            )
-            session.add(cart)
-            await session.flush()
+        .returning(Cart.id)
+        .cte("cart")
+    )
 
-        cart_item = await session.scalar(
-            select(CartItem)
-            .where(
-                CartItem.cart_id == cart.id, CartItem.product_id == product_id
-            )
-            .options(selectinload(CartItem.product))
-        )
+    item_insert = insert(CartItem).from_select(
+        ["cart_id", "product_id", "quantity"],
+        # товар выбирается из app_product: FK в Django отложенные
+        # (DEFERRABLE), поэтому несуществующий товар иначе всплыл бы
+        # только на COMMIT
+        select(cart_cte.c.id, Product.id, literal(quantity)).select_from(
+            cart_cte.join(Product, Product.id == product_id)
+        ),
+    )
+    stmt = item_insert.on_conflict_do_update(
+        index_elements=[CartItem.cart_id, CartItem.product_id],
+        set_={"quantity": CartItem.quantity + item_insert.excluded.quantity},
+    ).returning(CartItem)
 
-        if cart_item:
-            cart_item.quantity += quantity
-        else:
-            product = await get_product(product_id, session)
-            if not product:
-                raise ValueError(f"Товар с product_id={product_id} не найден")
-            cart_item = CartItem(
-                cart_id=cart.id,
-                product_id=product_id,
-                quantity=quantity,
-                product=product,
+    async with session.begin():
+        cart_item = await session.scalar(stmt)
+        if not cart_item:
+            raise ValueError(
+                f"Клиент с telegram_id={telegram_id} "
+                f"или товар с product_id={product_id} не найден"
             )
-            session.add(cart_item)
 
-        await session.flush()
         return cart_item
 
 
 async def get_cart_items(
     telegram_id: int, session: AsyncSession
 ) -> List[CartItem]:
-    client = await get_client_by_telegram_id(telegram_id, session)
-    if not client:
+    client_id = await get_client_id(telegram_id, session)
+    if not client_id:
         logger.warning(f"Клиент с ID {telegram_id} не найден")
         return []
 
     stmt = (
         select(Cart)
-        .where(Cart.client_id == client.id)
+        .where(Cart.client_id == client_id)
         .options(selectinload(Cart.items).selectinload(CartItem.product))
     )
     result = await session.execute(stmt)
@@ -186,14 +386,35 @@ async def get_cart_items(
     return cart.items
 
 
+async def get_cart_total(
+    telegram_id: int, session: AsyncSession
+) -> Tuple[Decimal, int]:
+    """
+    Функция для пересчёта корзины клиента по текущим ценам:
+    возвращает сумму и число позиций.
+    """
+    stmt = (
+        select(
+            func.coalesce(func.sum(CartItem.quantity * Product.price), 0),
+            func.count(CartItem.id),
+        )
+        .join(Product, Product.id == CartItem.product_id)
+        .join(Cart, Cart.id == CartItem.cart_id)
+        .join(Client, Client.id == Cart.client_id)
+        .where(Client.telegram_id == telegram_id)
+    )
+    total, items_count = (await session.execute(stmt)).one()
+    return Decimal(total), items_count
+
+
 async def clear_cart_items(telegram_id: int, session: AsyncSession) -> bool:
     async with session.begin():
-        client = await get_client_by_telegram_id(telegram_id, session)
-        if not client:
+        client_id = await get_client_id(telegram_id, session)
+        if not client_id:
             logger.warning(f"Клиент с telegram_id={telegram_id} не найден")
             return False
 
-        cart = await get_cart_by_client_id(client.id, session, with_items=True)
+        cart = await get_cart_by_client_id(client_id, session, with_items=True)
         if not cart:
             logger.info(f"Корзина для клиента {telegram_id} не найдена")
             return False
@@ -213,69 +434,210 @@ async def create_order_from_cart(
     telegram_id: int,
     address: ShippingAddress,
     session: AsyncSession,
+    outbox_events: Sequence[str] = (),
 ) -> Optional[List[OrderItem]]:
-    async with session.begin():
-        client = await get_client_by_telegram_id(telegram_id, session)
-        if not client:
-            logger.warning(f"Клиент с telegram_id={telegram_id} не найден")
-            return None
-
-        stmt = (
-            select(Cart)
-            .where(Cart.client_id == client.id)
-            .options(selectinload(Cart.items).selectinload(CartItem.product))
+    """
+    Функция оформления заказа из корзины клиента одним запросом.
+
+    Позиции корзины удаляются (DELETE ... RETURNING), по ним вставляются
+    заказ с суммой, посчитанной в SQL, и позиции заказа
+    (INSERT ... SELECT ... RETURNING). В том же запросе для созданного
+    заказа пишется по событию outbox каждого типа из outbox_events.
+    Возвращает позиции заказа с подгруженными товарами или None,
+    если корзина пуста.
+    """
+    address_str = ", ".join(
+        filter(
+            None,
+            [
+                address.country_code,
+                address.state,
+                address.city,
+                address.street_line1,
+                address.street_line2,
+                address.post_code,
+            ],
         )
-        result = await session.execute(stmt)
-        cart = result.scalar_one_or_none()
+    )
 
-        if not cart or not cart.items:
-            logger.warning(
-                f"Корзина пуста или не найдена для клиента {telegram_id}"
+    removed = (
+        delete(CartItem)
+        .where(
+            CartItem.cart_id == Cart.id,
+            Cart.client_id == Client.id,
+            Client.telegram_id == telegram_id,
+        )
+        .returning(Cart.client_id, CartItem.product_id, CartItem.quantity)
+        .cte("removed")
+    )
+    priced = (
+        select(
+            removed.c.client_id,
+            removed.c.product_id,
+            removed.c.quantity,
+            Product.price,
+        )
+        .join(Product, Product.id == removed.c.product_id)
+        .cte("priced")
+    )
+    new_order = (
+        insert(Order)
+        .from_select(
+            ["client_id", "total_price", "address", "created_at"],
+            select(
+                priced.c.client_id,
+                func.sum(priced.c.quantity * priced.c.price),
+                literal(address_str),
+                func.now(),
+            ).group_by(priced.c.client_id),
+        )
+        .returning(Order.id)
+        .cte("new_order")
+    )
+    inserted = (
+        insert(OrderItem)
+        .from_select(
+            ["order_id", "product_id", "quantity", "price"],
+            select(
+                new_order.c.id,
+                priced.c.product_id,
+                priced.c.quantity,
+                priced.c.price,
+            ).select_from(new_order.join(priced, true())),
+        )
+        .returning(*OrderItem.__table__.c)
+        .cte("inserted")
+    )
+    order_item = aliased(OrderItem, inserted)
+    stmt = (
+        select(order_item)
+        .join(order_item.product)
+        .options(contains_eager(order_item.product))
+    )
+    if outbox_events:
+        consumers = values(
+            column("event_type", String), name="consumers"
+        ).data([(event_type,) for event_type in outbox_events])
+        payload = literal(
+            {
+                "user_id": telegram_id,
+                "shipping_address": address.model_dump(mode="json"),
+            },
+            JSONB,
+        ).op("||")(func.jsonb_build_object("order_id", new_order.c.id))
+        outbox = (
+            insert(OutboxEvent)
+            .from_select(
+                ["event_type", "payload", "idempotency_key"],
+                select(
+                    consumers.c.event_type,
+                    payload,
+                    consumers.c.event_type
+                    + ":"
+                    + cast(new_order.c.id, String),
+                ).select_from(new_order.join(consumers, true())),
             )
-            return None
+            .cte("outbox")
+        )
+        # CTE с INSERT выполняется, даже если основной запрос его не читает
+        stmt = stmt.add_cte(outbox)
+
+    async with session.begin():
+        result = await session.scalars(stmt)
+        order_items: List[OrderItem] = list(result.all())
 
-        total_price = sum(
-            item.quantity * item.product.price for item in cart.items
+    if not order_items:
+        logger.warning(
+            f"Корзина пуста или не найдена для клиента {telegram_id}"
         )
+        return None
 
-        address_str = ", ".join(
-            filter(
-                None,
-                [
-                    address.country_code,
-                    address.state,
-                    address.city,
-                    address.street_line1,
-                    address.street_line2,
-                    address.post_code,
-                ],
-            )
+    logger.info(
+        f"Создан заказ {order_items[0].order_id} для клиента {telegram_id}"
+    )
+    return order_items
+
+
+async def get_order_items(
+    order_id: int, session: AsyncSession
+) -> List[OrderItem]:
+    """Функция для получения позиций заказа с товарами."""
+    result = await session.scalars(
+        select(OrderItem)
+        .where(OrderItem.order_id == order_id)
+        .options(selectinload(OrderItem.product))
+        .order_by(OrderItem.id)
+    )
+    return list(result.all())
+
+
+async def claim_outbox_events(
+    limit: int, lease: float, session: AsyncSession
+) -> List[OutboxEvent]:
+    """
+    Функция для захвата пачки готовых к обработке событий outbox.
+
+    Строки выбираются с FOR UPDATE SKIP LOCKED, поэтому воркеры не
+    мешают друг другу, а available_at сдвигается на время аренды:
+    если воркер упадёт, событие снова станет доступно после неё.
+    """
+    picked = (
+        select(OutboxEvent.id)
+        .where(
+            OutboxEvent.status == "pending",
+            OutboxEvent.available_at <= func.now(),
         )
+        .order_by(OutboxEvent.available_at, OutboxEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte("picked")
+    )
+    stmt = (
+        update(OutboxEvent)
+        .where(OutboxEvent.id.in_(select(picked.c.id)))
+        .values(
+            attempts=OutboxEvent.attempts + 1,
+            available_at=func.now() + timedelta(seconds=lease),
+        )
+        .returning(OutboxEvent)
+    )
+    async with session.begin():
+        result = await session.scalars(
+            stmt, execution_options={"synchronize_session": False}
+        )
+        return list(result.all())
+
 
-        new_order = Order(
-            client_id=client.id,
-            total_price=total_price,
-            address=address_str,
-            created_at=datetime.now(timezone.utc),
+async def complete_outbox_event(event_id: int, session: AsyncSession):
+    """Функция для отметки события outbox как обработанного."""
+    async with session.begin():
+        await session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id)
+            .values(status="done", processed_at=func.now(), last_error="")
         )
-        session.add(new_order)
-        await session.flush()
 
-        order_items: List[OrderItem] = []
-        for item in cart.items:
-            order_item = OrderItem(
-                order_id=new_order.id,
-                product_id=item.product.id,
-                quantity=item.quantity,
-                price=item.product.price,
-            )
-            session.add(order_item)
-            order_items.append(order_item)
 
-        # Удаляем корзину и её товары
-        for item in cart.items:
-            await session.delete(item)
-        await session.delete(cart)
+async def fail_outbox_event(
+    event_id: int,
+    error: str,
+    retry_in: Optional[float],
+    session: AsyncSession,
+):
+    """
+    Функция для записи ошибки обработки события outbox: событие
+    повторится через retry_in секунд, а при retry_in=None —
+    помечается как окончательно не обработанное.
+    """
+    changes = {"last_error": error}
+    if retry_in is None:
+        changes["status"] = "failed"
+    else:
+        changes["available_at"] = func.now() + timedelta(seconds=retry_in)
 
-        logger.info(f"Создан заказ {new_order.id} для клиента {telegram_id}")
-        return order_items
+    async with session.begin():
+        await session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id)
+            .values(**changes)
+        )
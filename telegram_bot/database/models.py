@@ -1,13 +1,19 @@
 from datetime import datetime, timezone
 
 from sqlalchemy import (
+    BigInteger,
+    Boolean,
     Integer,
     String,
     DateTime,
     ForeignKey,
     Text,
     Numeric,
+    SmallInteger,
+    UniqueConstraint,
+    func,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship, DeclarativeBase, Mapped, mapped_column
 from typing import Optional, List
 
@@ -51,6 +57,11 @@ class Category(Base):
         ForeignKey("app_category.id"),
         nullable=True,
     )
+    # материализованный путь «/1/5/12/» и глубина, ведёт админка
+    path: Mapped[str] = mapped_column(
+        String(255, collation="C"), server_default=""
+    )
+    depth: Mapped[int] = mapped_column(SmallInteger, server_default="0")
     parent: Mapped[Optional["Category"]] = relationship(
         remote_side=[id], back_populates="subcategories"
     )
@@ -73,6 +84,10 @@ class Product(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     price: Mapped[float] = mapped_column(Numeric(10, 2))
     photo: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # версия фото для Telegram, которую готовит админка
+    photo_optimized: Mapped[str] = mapped_column(String, default="")
+    photo_hash: Mapped[str] = mapped_column(String(64), default="")
+    telegram_file_id: Mapped[str] = mapped_column(String(255), default="")
 
     category: Mapped["Category"] = relationship(back_populates="products")
     cart_items: Mapped[List["CartItem"]] = relationship(
@@ -110,6 +125,11 @@ class CartItem(Base):
     """
 
     __tablename__ = "app_cartitem"
+    __table_args__ = (
+        UniqueConstraint(
+            "cart_id", "product_id", name="app_cartitem_unique_cart_product"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     cart_id: Mapped[int] = mapped_column(ForeignKey("app_cart.id"))
@@ -160,3 +180,63 @@ class OrderItem(Base):
     product: Mapped[Optional["Product"]] = relationship(
         back_populates="order_items"
     )
+
+
+class CatalogVersion(Base):
+    """
+    Версия каталога, соответствующая Django модели CatalogVersion.
+    Увеличивается админкой при любом изменении категорий и товаров.
+    """
+
+    __tablename__ = "app_catalogversion"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class Faq(Base):
+    """
+    Вопрос FAQ, соответствующий Django модели Faq.
+    Редактируется только в админке, бот его лишь читает.
+    """
+
+    __tablename__ = "app_faq"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    question: Mapped[str] = mapped_column(String(255))
+    answer: Mapped[str] = mapped_column(Text)
+    position: Mapped[int] = mapped_column(Integer, default=0)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class OutboxEvent(Base):
+    """
+    Событие outbox, соответствующее Django модели OutboxEvent.
+    Создаётся вместе с заказом, обрабатывается фоновым воркером.
+    """
+
+    __tablename__ = "app_outboxevent"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(64))
+    payload: Mapped[dict] = mapped_column(JSONB, default=dict)
+    idempotency_key: Mapped[str] = mapped_column(String(255), unique=True)
+    # значения по умолчанию задаёт БД (db_default в Django)
+    status: Mapped[str] = mapped_column(String(16), server_default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, server_default="0")
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    processed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_error: Mapped[str] = mapped_column(Text, server_default="")
@@ -1,3 +1,4 @@
+from .callback_data import DataFilter
 from .filters import (
     CategoryFilter,
     SubCategoryFilter,
@@ -9,6 +10,7 @@ from .filters import (
 )
 
 __all__ = (
+    "DataFilter",
     "CategoryFilter",
     "SubCategoryFilter",
     "ProductFilter",
@@ -0,0 +1,134 @@
+from typing import Any, Dict, Literal, Optional, Type, TypeVar, Union
+
+from aiogram.filters import Filter
+from aiogram.filters.callback_data import (
+    MAX_CALLBACK_LENGTH,
+    CallbackData,
+    CallbackQueryFilter,
+)
+from aiogram.types import CallbackQuery
+from magic_filter import MagicFilter
+from pydantic_core import PydanticUndefined
+
+T = TypeVar("T", bound="CompactCallbackData")
+
+ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(ALPHABET)
+
+
+def encode_int(value: Optional[int]) -> str:
+    """Число в base36, None — пустая строка."""
+    if value is None:
+        return ""
+    if value < 0:
+        return "-" + encode_int(-value)
+    if value < BASE:
+        return ALPHABET[value]
+
+    digits = []
+    while value:
+        value, digit = divmod(value, BASE)
+        digits.append(ALPHABET[digit])
+    return "".join(reversed(digits))
+
+
+class CompactCallbackData(CallbackData, prefix=""):
+    """
+    Callback data с короткой записью: числовой префикс и целые поля
+    в base36 через двоеточие, например «3:21i3v9:1:l5qi».
+
+    Поддерживаются только поля int и int | None. Разбор сразу приводит
+    поля к int, а фильтр отбрасывает чужие callback по префиксу,
+    не пытаясь их разобрать.
+    """
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        fields = []
+        for name, field in cls.model_fields.items():
+            if field.annotation not in (int, Optional[int]):
+                raise TypeError(
+                    f"{cls.__name__}.{name}: поддерживаются только int "
+                    f"и int | None, а не {field.annotation}"
+                )
+            fields.append((name, field.default))
+        cls.__codec_fields__ = tuple(fields)
+        cls.__codec_head__ = cls.__prefix__ + cls.__separator__
+
+    def pack(self) -> str:
+        callback_data = self.__separator__.join(
+            (
+                self.__prefix__,
+                *(
+                    encode_int(getattr(self, name))
+                    for name, _ in self.__codec_fields__
+                ),
+            )
+        )
+        if len(callback_data) > MAX_CALLBACK_LENGTH:
+            raise ValueError(
+                f"Callback data {callback_data!r} длиннее "
+                f"{MAX_CALLBACK_LENGTH} байт"
+            )
+        return callback_data
+
+    @classmethod
+    def unpack(cls: Type[T], value: str) -> T:
+        prefix, *parts = value.split(cls.__separator__)
+        if prefix != cls.__prefix__:
+            raise ValueError(f"Bad prefix ({prefix!r} != {cls.__prefix__!r})")
+        if len(parts) != len(cls.__codec_fields__):
+            raise TypeError(
+                f"Callback data {cls.__name__!r} takes "
+                f"{len(cls.__codec_fields__)} arguments "
+                f"but {len(parts)} were given"
+            )
+
+        payload = {}
+        for (name, default), part in zip(cls.__codec_fields__, parts):
+            if part:
+                payload[name] = int(part, BASE)
+            elif default is PydanticUndefined:
+                raise ValueError(f"Missing required field {name!r}")
+            else:
+                payload[name] = default
+        # значения уже int, поэтому валидация pydantic тут дешёвая
+        return cls(**payload)
+
+    @classmethod
+    def filter(
+        cls, rule: Optional[MagicFilter] = None
+    ) -> "CompactCallbackQueryFilter":
+        return CompactCallbackQueryFilter(callback_data=cls, rule=rule)
+
+
+class CompactCallbackQueryFilter(CallbackQueryFilter):
+    """Фильтр, который сначала сверяет префикс callback data."""
+
+    async def __call__(
+        self, query: CallbackQuery
+    ) -> Union[Literal[False], Dict[str, Any]]:
+        data = getattr(query, "data", None)
+        if not data or not data.startswith(self.callback_data.__codec_head__):
+            return False
+        return await super().__call__(query)
+
+
+class DataFilter(Filter):
+    """
+    Точное совпадение callback data со строкой.
+
+    Аналог F.data == "...", но асинхронный (MagicFilter aiogram
+    выполняет в потоке) и со значением в публичном атрибуте data,
+    по которому строится индекс обработчиков callback.
+    """
+
+    def __init__(self, data: str):
+        self.data = data
+
+    async def __call__(self, query: CallbackQuery) -> bool:
+        return query.data == self.data
+
+    def __str__(self) -> str:
+        return f"DataFilter(data={self.data!r})"
@@ -1,10 +1,11 @@
 from typing import List, Optional
 
-from aiogram.filters.callback_data import CallbackData
 from database.models import CartItem
 
+from .callback_data import CompactCallbackData
 
-class CategoryFilter(CallbackData, prefix="category"):
+
+class CategoryFilter(CompactCallbackData, prefix="1"):
     """
     Кастомный фильтр для навигации по категориям.
     """
@@ -14,7 +15,7 @@ class CategoryFilter(CallbackData, prefix="category"):
     parent_id: int | None = None
 
 
-class SubCategoryFilter(CallbackData, prefix="subcategory"):
+class SubCategoryFilter(CompactCallbackData, prefix="2"):
     """
     Кастомный фильтр для навигации по подкатегориям.
     """
@@ -24,7 +25,7 @@ class SubCategoryFilter(CallbackData, prefix="subcategory"):
     parent_id: int | None = None
 
 
-class ProductFilter(CallbackData, prefix="product"):
+class ProductFilter(CompactCallbackData, prefix="3"):
     """
     Кастомный фильтр для навигации по товарам.
     """
@@ -34,23 +35,23 @@ class ProductFilter(CallbackData, prefix="product"):
     parent_id: int | None = None
 
 
-class AddToCartFilter(CallbackData, prefix="add_to_cart"):
+class AddToCartFilter(CompactCallbackData, prefix="4"):
     id: int
 
 
-class SetQuantityFilter(CallbackData, prefix="set_quantity"):
+class SetQuantityFilter(CompactCallbackData, prefix="5"):
     id: int
     quantity: int
 
 
-class ConfirmAddToCartFilter(CallbackData, prefix="confirm_add_to_cart"):
+class ConfirmAddToCartFilter(CompactCallbackData, prefix="6"):
     id: int
     quantity: int
 
 
-class RemoveFromCartFilter(CallbackData, prefix="remove_from_cart"):
+class RemoveFromCartFilter(CompactCallbackData, prefix="7"):
     user_id: int
 
 
-class PaymentFilter(CallbackData, prefix="payment"):
+class PaymentFilter(CompactCallbackData, prefix="8"):
     order_id: int
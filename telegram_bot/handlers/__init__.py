@@ -1,5 +1,7 @@
 from aiogram import Router
 
+from .callback_index import IndexedRouter
+
 
 def get_handlers_router() -> Router:
     from . import payment_handlers
@@ -7,12 +9,18 @@ def get_handlers_router() -> Router:
     from . import show_categories
     from . import cart_handlers
     from . import faq_handler
+    from . import subscriptions
+    from . import outdated_callbacks
 
-    router = Router()
+    router = IndexedRouter()
     router.include_router(payment_handlers.router)
     router.include_router(start.router)
     router.include_router(show_categories.router)
     router.include_router(cart_handlers.router)
     router.include_router(faq_handler.router)
+    router.include_router(subscriptions.router)
+    # последним: принимает callback, не подошедшие остальным
+    router.include_router(outdated_callbacks.router)
+    router.build_index()
 
     return router
@@ -0,0 +1,215 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from aiogram import Router
+from aiogram.dispatcher.event.bases import REJECTED, SkipHandler
+from aiogram.dispatcher.event.handler import FilterObject, HandlerObject
+from aiogram.dispatcher.event.telegram import TelegramEventObserver
+from aiogram.dispatcher.middlewares.manager import MiddlewareManager
+from aiogram.types import CallbackQuery
+from config import logger
+from filters import DataFilter
+from filters.callback_data import CompactCallbackQueryFilter
+
+SEPARATOR = ":"
+
+
+class IndexedHandler(NamedTuple):
+    # порядок обхода в дереве роутеров: при нескольких кандидатах
+    # побеждает тот, кто победил бы при обычной цепочке
+    order: int
+    router: Router
+    observer: TelegramEventObserver
+    handler: HandlerObject
+    # фильтры, которые осталось проверить после совпадения по индексу
+    filters: Tuple[FilterObject, ...]
+    # роутеры от подключённого к индексу до router: их общие фильтры
+    # callback_query проверяются так же, как при обычной цепочке
+    routers: Tuple[Router, ...]
+
+
+def get_index_key(
+    filter_object: Optional[FilterObject],
+) -> Tuple[str, str] | None:
+    """
+    Ключ индекса по первому фильтру обработчика:
+    ("exact", data) для DataFilter("...") и ("prefix", "3:") для
+    компактных CallbackData. Остальные фильтры не индексируются.
+    """
+
+    if filter_object is None:
+        return None
+
+    callback = filter_object.callback
+    if isinstance(callback, DataFilter):
+        return "exact", callback.data
+    if isinstance(callback, CompactCallbackQueryFilter):
+        return "prefix", callback.callback_data.__codec_head__
+    return None
+
+
+class IndexedCallbackQueryObserver(TelegramEventObserver):
+    """
+    Наблюдатель callback_query роутера, который находит обработчик
+    по индексу (точное значение data или префикс) среди обработчиков
+    всех его подроутеров, а не перебирает их по цепочке.
+
+    Фильтры, общие фильтры подроутеров, внутренние middleware и
+    event_router кандидата те же, что при обычной маршрутизации.
+    Callback без кандидатов дальше по дереву не распространяется.
+    """
+
+    def __init__(self, router: Router):
+        super().__init__(router=router, event_name="callback_query")
+        self._exact: Dict[str, List[IndexedHandler]] = {}
+        self._prefixed: Dict[str, List[IndexedHandler]] = {}
+        self._unindexed: List[IndexedHandler] = []
+        # неиндексируемые обработчики после всех индексируемых:
+        # проверяются последними, без сортировки кандидатов
+        self._fallback: List[IndexedHandler] = []
+
+    def filter(self, *filters: Any) -> None:
+        raise RuntimeError(
+            "Общие фильтры callback_query задаются в подроутерах "
+            "индексированного роутера"
+        )
+
+    def build_index(self) -> None:
+        self._exact.clear()
+        self._prefixed.clear()
+        self._unindexed.clear()
+        self._fallback.clear()
+
+        order = 0
+        last_indexed = -1
+        for router in self.router.chain_tail:
+            observer = router.observers["callback_query"]
+            if router is not self.router and len(observer.outer_middleware):
+                raise RuntimeError(
+                    f"Индекс callback не поддерживает outer middleware "
+                    f"callback_query в роутере {router}"
+                )
+
+            routers = self._get_routers(router)
+            for handler in observer.handlers:
+                filters = tuple(handler.filters or ())
+                key = get_index_key(filters[0] if filters else None)
+                if key is None:
+                    self._unindexed.append(
+                        IndexedHandler(
+                            order, router, observer, handler, filters, routers
+                        )
+                    )
+                elif key[0] == "exact":
+                    # совпадение data уже гарантировано индексом
+                    self._exact.setdefault(key[1], []).append(
+                        IndexedHandler(
+                            order,
+                            router,
+                            observer,
+                            handler,
+                            filters[1:],
+                            routers,
+                        )
+                    )
+                    last_indexed = order
+                else:
+                    self._prefixed.setdefault(key[1], []).append(
+                        IndexedHandler(
+                            order, router, observer, handler, filters, routers
+                        )
+                    )
+                    last_indexed = order
+                order += 1
+
+        while self._unindexed and self._unindexed[-1].order > last_indexed:
+            self._fallback.insert(0, self._unindexed.pop())
+
+        logger.info(
+            "Построен индекс обработчиков callback",
+            exact=len(self._exact),
+            prefixes=len(self._prefixed),
+            unindexed=len(self._unindexed),
+            fallback=len(self._fallback),
+        )
+
+    def _get_routers(self, router: Router) -> Tuple[Router, ...]:
+        routers = []
+        for parent in router.chain_head:
+            if parent is self.router:
+                break
+            routers.append(parent)
+        return tuple(reversed(routers))
+
+    def get_candidates(self, data: str) -> List[IndexedHandler]:
+        candidates = self._exact.get(data, ())
+        head = data[: data.find(SEPARATOR) + 1]
+        prefixed = self._prefixed.get(head, ()) if head else ()
+        if prefixed or self._unindexed:
+            candidates = sorted((*candidates, *prefixed, *self._unindexed))
+        if self._fallback:
+            return [*candidates, *self._fallback]
+        return candidates
+
+    @staticmethod
+    async def _check(
+        entry: IndexedHandler, event: CallbackQuery, kwargs: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        kwargs = {**kwargs, "event_router": entry.router}
+        for router in entry.routers:
+            result, data = await router.callback_query.check_root_filters(
+                event, **kwargs
+            )
+            if not result:
+                return None
+            kwargs.update(data)
+
+        kwargs["handler"] = entry.handler
+        for filter_object in entry.filters:
+            check = await filter_object.call(event, **kwargs)
+            if not check:
+                return None
+            if isinstance(check, dict):
+                kwargs.update(check)
+        return kwargs
+
+    @staticmethod
+    def _get_middlewares(router: Router) -> List[Any]:
+        # внутренние middleware от корня до роутера обработчика,
+        # как их собирает TelegramEventObserver
+        middlewares = []
+        for parent in reversed(tuple(router.chain_head)):
+            observer = parent.observers.get("callback_query")
+            if observer:
+                middlewares.extend(observer.middleware)
+        return middlewares
+
+    async def trigger(self, event: CallbackQuery, **kwargs: Any) -> Any:
+        for entry in self.get_candidates(event.data or ""):
+            data = await self._check(entry, event, kwargs)
+            if data is None:
+                continue
+            wrapped_inner = MiddlewareManager.wrap_middlewares(
+                self._get_middlewares(entry.router), entry.handler.call
+            )
+            try:
+                return await wrapped_inner(event, data)
+            except SkipHandler:
+                continue
+
+        return REJECTED
+
+
+class IndexedRouter(Router):
+    """
+    Роутер, который маршрутизирует callback_query своих подроутеров
+    по индексу. Собственных обработчиков callback_query не содержит;
+    build_index() вызывается после подключения всех подроутеров.
+    """
+
+    def __init__(self, *, name: Optional[str] = None):
+        super().__init__(name=name)
+        self.callback_query = IndexedCallbackQueryObserver(self)
+        self.observers["callback_query"] = self.callback_query
+
+    def build_index(self) -> None:
+        self.callback_query.build_index()
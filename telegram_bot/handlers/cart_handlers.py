@@ -1,6 +1,6 @@
 from typing import List
 
-from aiogram import F, Router
+from aiogram import Router
 from aiogram.types import CallbackQuery
 from config import logger
 from database import add_to_cart, clear_cart_items, get_cart_items
@@ -8,6 +8,7 @@ from database.models import CartItem
 from filters import (
     AddToCartFilter,
     ConfirmAddToCartFilter,
+    DataFilter,
     RemoveFromCartFilter,
     SetQuantityFilter,
 )
@@ -19,7 +20,11 @@ from keyboards import (
     get_start_order_keyboard,
 )
 from locales.constants_text_ru import ITEMS_IN_CART
-from services import create_youkassa_invoice_link
+from services import (
+    create_youkassa_invoice_link,
+    forget_invoice_link,
+    get_cart_key,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = Router()
@@ -77,7 +82,16 @@ async def confirm_add_to_cart_handler(
         product_id=product_id,
         quantity=quantity,
     )
-    await add_to_cart(user_id, product_id, quantity, session)
+    cart_item: CartItem = await add_to_cart(
+        user_id, product_id, quantity, session
+    )
+    forget_invoice_link(user_id)
+    logger.info(
+        "Товар добавлен в корзину",
+        user_id=user_id,
+        product_id=product_id,
+        cart_quantity=cart_item.quantity,
+    )
     keyboard = await get_main_menu_keyboard()
     await call.message.delete()
     await call.message.answer(
@@ -85,7 +99,7 @@ async def confirm_add_to_cart_handler(
     )
 
 
-@router.callback_query(F.data == "cart_handler")
+@router.callback_query(DataFilter("cart_handler"))
 async def cart_handler(call: CallbackQuery, session: AsyncSession):
     user_id = call.from_user.id
     logger.info("Пользователь открыл корзину", user_id=user_id)
@@ -118,7 +132,7 @@ async def cart_handler(call: CallbackQuery, session: AsyncSession):
         await call.message.answer("Произошла ошибка при отображении корзины.")
 
 
-@router.callback_query(F.data == "order_cart_items")
+@router.callback_query(DataFilter("order_cart_items"))
 async def start_order(call: CallbackQuery, session: AsyncSession):
     user_id = call.from_user.id
     logger.info("Начало оформления заказа", user_id=user_id)
@@ -142,7 +156,9 @@ async def start_order(call: CallbackQuery, session: AsyncSession):
         return
 
     price = sum(item.quantity * item.product.price for item in cart_items)
-    invoice_link = await create_youkassa_invoice_link(price, user_id)
+    invoice_link = await create_youkassa_invoice_link(
+        price, user_id, get_cart_key(cart_items)
+    )
     logger.info(
         "Сформирована ссылка на оплату",
         user_id=user_id,
@@ -161,11 +177,12 @@ async def clear_cart_handler(
 ):
     logger.info("Очистка корзины", user_id=callback_data.user_id)
     await clear_cart_items(callback_data.user_id, session)
+    forget_invoice_link(callback_data.user_id)
     await call.message.edit_text("Ваша корзина теперь пуста")
     await show_main_menu(call, session)
 
 
-@router.callback_query(F.data == "none")
+@router.callback_query(DataFilter("none"))
 async def noop_callback(call: CallbackQuery):
     logger.debug("Нажата заглушка-кнопка", user_id=call.from_user.id)
     await call.answer()
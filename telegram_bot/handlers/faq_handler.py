@@ -1,69 +1,35 @@
-from uuid import uuid4
-
-from aiogram import F, Router
-from aiogram.types import (
-    CallbackQuery,
-    InlineQuery,
-    InlineQueryResultArticle,
-    InputTextMessageContent,
-)
+from aiogram import Router
+from aiogram.types import CallbackQuery, InlineQuery
 from config import BOT_NAME, logger
+from constants import FAQ_INLINE_CACHE_TIME
+from filters import DataFilter
 from keyboards import get_to_main_menu_keyboard
 from locales.constants_text_ru import FAQ_TEXT
+from services import faq
 
 router = Router()
 
-# можно вывести в БД
-FAQS = [
-    {
-        "question": "Как сделать заказ?",
-        "answer": "Чтобы сделать заказ, перейдите в каталог и выберите товар.",
-    },
-    {
-        "question": "Какие способы оплаты?",
-        "answer": "Мы принимаем оплату картой, через YooKassa и т.д.",
-    },
-    {
-        "question": "Как отменить заказ?",
-        "answer": "Напишите в поддержку, указав номер заказа.",
-    },
-    {
-        "question": "Сколько идет доставка?",
-        "answer": "Обычно доставка занимает 2-5 рабочих дней.",
-    },
-]
-
 
 @router.inline_query()
 async def inline_faq_handler(inline_query: InlineQuery):
     user_id = inline_query.from_user.id
-    query = inline_query.query.lower()
+    query = inline_query.query
     logger.info(
         "Пользователь ввел inline-запрос", user_id=user_id, query=query
     )
 
-    results = []
-    for faq in FAQS:
-        if query in faq["question"].lower():
-            results.append(
-                InlineQueryResultArticle(
-                    id=str(uuid4()),
-                    title=faq["question"],
-                    description=faq["answer"][:50],
-                    input_message_content=InputTextMessageContent(
-                        message_text=f"*{faq['question']}*\n\n{faq['answer']}",
-                        parse_mode="Markdown",
-                    ),
-                )
-            )
+    results = faq.search(query)
 
     logger.info(
         "Inline-запрос обработан", user_id=user_id, results_found=len(results)
     )
-    await inline_query.answer(results, cache_time=1)
+    # результаты не зависят от пользователя, их может кэшировать Telegram
+    await inline_query.answer(
+        results, cache_time=FAQ_INLINE_CACHE_TIME, is_personal=False
+    )
 
 
-@router.callback_query(F.data == "faq_handler")
+@router.callback_query(DataFilter("faq_handler"))
 async def faq_handler(call: CallbackQuery):
     user_id = call.from_user.id
     logger.info("Открыт раздел FAQ", user_id=user_id)
@@ -0,0 +1,35 @@
+from aiogram import Router
+from aiogram.types import CallbackQuery, Message
+from config import logger
+from keyboards import get_main_menu_keyboard
+from locales.constants_text_ru import OUTDATED_MENU
+
+router = Router()
+
+
+@router.callback_query()
+async def outdated_callback(call: CallbackQuery):
+    """
+    Callback, который не принял ни один обработчик: кнопки сообщений,
+    отправленных до смены формата callback data, и другие устаревшие
+    клавиатуры. Без ответа у пользователя крутится индикатор загрузки,
+    поэтому отвечаем и показываем главное меню. Роутер подключается
+    последним.
+    """
+
+    logger.info(
+        "Получен устаревший callback",
+        data=call.data,
+        user_id=call.from_user.id,
+    )
+    await call.answer(OUTDATED_MENU)
+    # сообщения старше 48 часов недоступны боту
+    if not isinstance(call.message, Message):
+        return
+
+    keyboard = await get_main_menu_keyboard()
+    try:
+        await call.message.edit_text(OUTDATED_MENU, reply_markup=keyboard)
+    except Exception:
+        # у сообщений с фото нет текста для правки
+        await call.message.answer(OUTDATED_MENU, reply_markup=keyboard)
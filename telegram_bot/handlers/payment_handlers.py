@@ -4,28 +4,72 @@ from typing import List
 from aiogram import F, Router, types
 from aiogram.types import ShippingAddress
 from config import bot, logger
-from database import create_order_from_cart
+from constants import PRE_CHECKOUT_TIMEOUT
+from database import create_order_from_cart, get_cart_total
 from database.models import OrderItem
-from services import append_order_to_excel
+from locales.constants_text_ru import (
+    PRE_CHECKOUT_CART_EMPTY,
+    PRE_CHECKOUT_ERROR,
+    PRE_CHECKOUT_PRICE_CHANGED,
+    PRE_CHECKOUT_TIMEOUT_ERROR,
+)
+from services import ORDER_PAID_EVENTS, forget_invoice_link, outbox
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = Router()
 
 
 @router.pre_checkout_query()
-async def pre_checkout_query(pre_checkout_q: types.PreCheckoutQuery):
-    """Подтверждение наличия товара перед оплатой"""
+async def pre_checkout_query(
+    pre_checkout_q: types.PreCheckoutQuery, session: AsyncSession
+):
+    """
+    Проверка заказа перед оплатой: корзина пересчитывается по текущим
+    ценам и сверяется с суммой счёта. Ответ обязан уложиться
+    в 10 секунд, поэтому проверка ограничена PRE_CHECKOUT_TIMEOUT.
+    """
 
-    user_id = pre_checkout_q.from_user.id
     logger.info(
         "Получен pre_checkout_query",
-        user_id=user_id,
         invoice_payload=pre_checkout_q.invoice_payload,
+        total_amount=pre_checkout_q.total_amount,
     )
 
-    await asyncio.sleep(0.5)  # <-- Критично!
-    await bot.answer_pre_checkout_query(pre_checkout_q.id, ok=True)
-    logger.info("Ответ на pre_checkout_query отправлен", user_id=user_id)
+    # без ответа Telegram отменит оплату через 10 секунд без объяснений,
+    # поэтому любая ошибка проверки превращается в ok=False
+    user_id = None
+    error_message = None
+    try:
+        user_id = int(pre_checkout_q.invoice_payload)
+        async with asyncio.timeout(PRE_CHECKOUT_TIMEOUT):
+            total, items_count = await get_cart_total(user_id, session)
+    except TimeoutError:
+        logger.error("Истекло время проверки заказа", user_id=user_id)
+        error_message = PRE_CHECKOUT_TIMEOUT_ERROR
+    except Exception:
+        logger.exception(
+            "Ошибка проверки заказа",
+            user_id=user_id,
+            invoice_payload=pre_checkout_q.invoice_payload,
+        )
+        error_message = PRE_CHECKOUT_ERROR
+    else:
+        if not items_count:
+            error_message = PRE_CHECKOUT_CART_EMPTY
+        elif int(total * 100) != pre_checkout_q.total_amount:
+            error_message = PRE_CHECKOUT_PRICE_CHANGED
+
+    await bot.answer_pre_checkout_query(
+        pre_checkout_q.id,
+        ok=error_message is None,
+        error_message=error_message,
+    )
+    logger.info(
+        "Ответ на pre_checkout_query отправлен",
+        user_id=user_id,
+        ok=error_message is None,
+        error_message=error_message,
+    )
 
 
 @router.message(F.successful_payment)
@@ -46,25 +90,18 @@ async def successful_payment(
         total_amount=message.successful_payment.total_amount,
     )
 
+    # выгрузка и уведомления пишутся в outbox в одной транзакции с заказом
     order_items: List[OrderItem] | None = await create_order_from_cart(
-        user_id, shipping_address, session
+        user_id, shipping_address, session, outbox_events=ORDER_PAID_EVENTS
     )
+    forget_invoice_link(user_id)
+    outbox.notify()
     logger.info(
         "Создание заказа из корзины завершено",
         user_id=user_id,
         items_count=len(order_items) if order_items else 0,
     )
 
-    try:
-        await append_order_to_excel(user_id, shipping_address, order_items)
-        logger.info("Заказ добавлен в Excel", user_id=user_id)
-    except Exception as e:
-        logger.error(
-            "Ошибка при сохранении заказа в Excel",
-            user_id=user_id,
-            error=str(e),
-        )
-
     if order_items:
         await message.answer("✅ Спасибо за оплату! Ваш заказ оформлен.")
         logger.info(
@@ -1,17 +1,13 @@
-import os
-
-from aiogram import F, Router
+from aiogram import Router
 from aiogram.exceptions import TelegramBadRequest
-from aiogram.types import CallbackQuery, FSInputFile, InputMediaPhoto, Message
+from aiogram.types import CallbackQuery, InputMediaPhoto, Message
 from config import logger
-from database import (
-    get_categories,
-    get_product,
-    get_products,
-    get_subcategories,
+from filters import (
+    CategoryFilter,
+    DataFilter,
+    ProductFilter,
+    SubCategoryFilter,
 )
-from database.models import Category, Product
-from filters import CategoryFilter, ProductFilter, SubCategoryFilter
 from keyboards import (
     get_add_to_cart_keyboard,
     get_catalog_keyboard,
@@ -25,12 +21,21 @@ from locales.constants_text_ru import (
     SELECT_PRODUCT,
     SELECT_SUBCATEGORY,
 )
+from services import (
+    ProductRecord,
+    catalog,
+    get_product_photo,
+    save_product_photo_file_id,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from utils import Pagination
 
 router = Router()
 
 
-@router.callback_query(F.data == "show_main_menu")
+@router.callback_query(
+    DataFilter("show_main_menu"), flags={"subscription_required": True}
+)
 async def show_main_menu(call: Message | CallbackQuery, session: AsyncSession):
     message = call.message if isinstance(call, CallbackQuery) else call
     keyboard = await get_main_menu_keyboard()
@@ -48,13 +53,12 @@ async def show_main_menu(call: Message | CallbackQuery, session: AsyncSession):
 @router.callback_query(CategoryFilter.filter())
 async def show_categories(
     call: Message | CallbackQuery,
-    session: AsyncSession,
     callback_data: CategoryFilter | None = None,
 ):
     message = call.message if isinstance(call, CallbackQuery) else call
 
-    categories: list[Category] = await get_categories(session)
-    if not categories:
+    categories: Pagination = await catalog.get_page("category")
+    if not categories.len:
         await message.answer("Категории пока не добавлены.")
         logger.warning(
             "Категории не найдены", extra={"user_id": call.from_user.id}
@@ -63,8 +67,7 @@ async def show_categories(
 
     if not callback_data or not callback_data.id:
         keyboard = await get_catalog_keyboard(
-            level="category",
-            items=categories,
+            categories,
             return_text=RETURN,
             return_callback="show_main_menu",
         )
@@ -81,11 +84,11 @@ async def show_categories(
                 user_id=call.from_user.id,
             )
     else:
-        subcategories = await get_subcategories(callback_data.id, session)
+        subcategories = await catalog.get_page(
+            "subcategory", callback_data.id, callback_data.page
+        )
         keyboard = await get_catalog_keyboard(
-            level="subcategory",
-            items=subcategories,
-            page=callback_data.page,
+            subcategories,
             parent_id=callback_data.id,
             return_text=RETURN,
             return_callback=CategoryFilter().pack(),
@@ -101,7 +104,6 @@ async def show_categories(
 @router.callback_query(SubCategoryFilter.filter())
 async def show_subcategories(
     call: CallbackQuery,
-    session: AsyncSession,
     callback_data: SubCategoryFilter,
 ):
     subcategory_id = callback_data.id
@@ -110,11 +112,11 @@ async def show_subcategories(
 
     try:
         if not subcategory_id and category_id:
-            subcategories = await get_subcategories(category_id, session)
+            subcategories = await catalog.get_page(
+                "subcategory", category_id, page
+            )
             keyboard = await get_catalog_keyboard(
-                level="subcategory",
-                items=subcategories,
-                page=page,
+                subcategories,
                 parent_id=category_id,
                 return_text=RETURN,
                 return_callback=CategoryFilter().pack(),
@@ -129,11 +131,9 @@ async def show_subcategories(
             )
 
         elif not subcategory_id and not category_id:
-            categories = await get_categories(session)
+            categories = await catalog.get_page("category")
             keyboard = await get_catalog_keyboard(
-                level="category",
-                items=categories,
-                page=1,
+                categories,
                 return_text=RETURN,
                 return_callback=ProductFilter().pack(),
             )
@@ -146,11 +146,9 @@ async def show_subcategories(
             )
 
         else:
-            products = await get_products(subcategory_id, session)
+            products = await catalog.get_page("product", subcategory_id)
             keyboard = await get_catalog_keyboard(
-                level="product",
-                items=products,
-                page=1,
+                products,
                 parent_id=subcategory_id,
                 return_text=RETURN,
                 return_callback=SubCategoryFilter(
@@ -192,11 +190,9 @@ async def show_products(
 
     try:
         if not product_id and subcategory_id:
-            products = await get_products(subcategory_id, session)
+            products = await catalog.get_page("product", subcategory_id, page)
             keyboard = await get_catalog_keyboard(
-                level="product",
-                items=products,
-                page=page,
+                products,
                 parent_id=subcategory_id,
                 return_text=RETURN,
                 return_callback=SubCategoryFilter().pack(),
@@ -209,12 +205,8 @@ async def show_products(
             )
 
         elif not product_id and not subcategory_id:
-            categories = await get_categories(session)
-            keyboard = await get_catalog_keyboard(
-                level="category",
-                items=categories,
-                page=1,
-            )
+            categories = await catalog.get_page("category")
+            keyboard = await get_catalog_keyboard(categories)
             await call.message.edit_text(
                 SELECT_CATEGORY, reply_markup=keyboard
             )
@@ -224,7 +216,9 @@ async def show_products(
             )
 
         else:
-            product: Product | None = await get_product(product_id, session)
+            product: ProductRecord | None = await catalog.get_product(
+                product_id
+            )
             if not product:
                 await call.message.answer(PRODUCT_NOT_FOUND)
                 logger.warning(
@@ -238,16 +232,18 @@ async def show_products(
                 product_id, callback_data
             )
 
-            if product.photo and os.path.exists(product.photo):
+            photo = await get_product_photo(product)
+            if photo:
                 media = InputMediaPhoto(
-                    media=FSInputFile(product.photo),
+                    media=photo,
                     caption=PRODUCT_DESCRIPTION.format(
                         product.name, product.description, product.price
                     ),
                 )
-                await call.message.edit_media(
+                sent = await call.message.edit_media(
                     media=media, reply_markup=keyboard, parse_mode="HTML"
                 )
+                await save_product_photo_file_id(product, sent, session)
                 logger.info(
                     "Показан товар с изображением",
                     user_id=call.from_user.id,
@@ -0,0 +1,40 @@
+from aiogram import F, Router
+from aiogram.types import CallbackQuery, ChatMemberUpdated
+from config import CHANNEL_ID, GROUP_ID, logger
+from filters import DataFilter
+from handlers.show_categories import show_main_menu
+from locales.constants_text_ru import NOT_SUBSCRIBED_YET
+from services.subscriptions_check import (
+    forget_membership,
+    is_chat_member,
+    is_user_subscribed,
+    update_membership,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = Router()
+
+
+@router.chat_member(F.chat.id.in_({CHANNEL_ID, GROUP_ID}))
+async def chat_member_updated(event: ChatMemberUpdated) -> None:
+    user_id = event.new_chat_member.user.id
+    is_member = is_chat_member(event.new_chat_member)
+    update_membership(event.chat.id, user_id, is_member)
+    logger.info(
+        "Обновлён статус подписки",
+        user_id=user_id,
+        chat_id=event.chat.id,
+        is_member=is_member,
+    )
+
+
+@router.callback_query(DataFilter("check_subscription_to_channels"))
+async def check_subscription(call: CallbackQuery, session: AsyncSession):
+    # пользователь только что подписался — кэшу доверять нельзя
+    forget_membership(call.from_user.id)
+    if not await is_user_subscribed(call.from_user.id):
+        await call.answer(NOT_SUBSCRIBED_YET, show_alert=True)
+        return
+
+    await call.answer()
+    await show_main_menu(call, session)
@@ -3,6 +3,7 @@ from typing import List
 from aiogram.types import InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from config import CHANNEL_URL, GROUP_URL
+from constants import CATALOG_KEYBOARD_CACHE_SIZE
 from database.models import CartItem
 from filters import (
     AddToCartFilter,
@@ -19,12 +20,13 @@ from locales.constants_text_ru import (
     OUR_GROUP,
     RETURN,
 )
-from utils import Pagination
+from utils import LRUCache, Pagination
 
+# (уровень, родитель, страница, ..., версия каталога) -> клавиатура
+catalog_keyboards = LRUCache(maxsize=CATALOG_KEYBOARD_CACHE_SIZE)
 
-async def get_subscription_keyboard():
-    """Инлайн клавиатура для подписки на каналы и группы."""
 
+def _build_subscription_keyboard():
     buttons = [
         [
             InlineKeyboardButton(
@@ -50,17 +52,55 @@ async def get_subscription_keyboard():
     return subscription_keyboard.as_markup()
 
 
+async def get_subscription_keyboard():
+    """Инлайн клавиатура для подписки на каналы и группы."""
+
+    return SUBSCRIPTION_KEYBOARD
+
+
 async def get_catalog_keyboard(
-    level: str,
-    items: List,
-    page: int = 1,
+    pagination: Pagination,
     parent_id: int = None,
     return_text: str = None,
     return_callback: str = None,
 ):
-    """Создает клавиатуру для каталога категорий, подкатегорий, товаров"""
+    """
+    Создает клавиатуру для каталога категорий, подкатегорий, товаров.
+
+    Страницы снимка каталога кэшируются: клавиатура зависит только
+    от уровня, родителя, страницы, кнопки возврата и версии каталога.
+    """
+
+    if pagination.version is None:
+        return _build_catalog_keyboard(
+            pagination, parent_id, return_text, return_callback
+        )
 
-    pagination = Pagination(level, items, page)
+    key = (
+        pagination.level,
+        parent_id,
+        pagination.page,
+        pagination.per_page,
+        return_text,
+        return_callback,
+        pagination.version,
+    )
+    markup = catalog_keyboards.get(key)
+    if markup is None:
+        markup = _build_catalog_keyboard(
+            pagination, parent_id, return_text, return_callback
+        )
+        catalog_keyboards.set(key, markup)
+    return markup
+
+
+def _build_catalog_keyboard(
+    pagination: Pagination,
+    parent_id: int = None,
+    return_text: str = None,
+    return_callback: str = None,
+):
+    level = pagination.level
     keyboard = InlineKeyboardBuilder()
 
     for item in pagination.get_page():
@@ -90,7 +130,7 @@ async def get_catalog_keyboard(
                 level=level,
                 id=None,
                 page=pagination.page - 1,
-                category_id=parent_id,
+                parent_id=parent_id,
             )
         elif level == "product":
             pagination_prev = ProductFilter(
@@ -115,7 +155,7 @@ async def get_catalog_keyboard(
         )
     pagination_btns.append(
         InlineKeyboardButton(
-            text=f"{page}/{pagination.pages}",
+            text=f"{pagination.page}/{pagination.pages}",
             callback_data="none",
         )
     )
@@ -123,7 +163,7 @@ async def get_catalog_keyboard(
     if pagination.has_next():
         if level == "subcategory":
             pagination_next = SubCategoryFilter(
-                id=None, page=pagination.page + 1, category_id=parent_id
+                id=None, page=pagination.page + 1, parent_id=parent_id
             )
         elif level == "product":
             pagination_next = ProductFilter(
@@ -155,9 +195,7 @@ async def get_catalog_keyboard(
     return keyboard.as_markup()
 
 
-async def get_main_menu_keyboard():
-    """Инлайн клавиатура главного меню."""
-
+def _build_main_menu_keyboard():
     buttons = [
         [
             InlineKeyboardButton(
@@ -183,6 +221,12 @@ async def get_main_menu_keyboard():
     return keyboard.as_markup()
 
 
+async def get_main_menu_keyboard():
+    """Инлайн клавиатура главного меню."""
+
+    return MAIN_MENU_KEYBOARD
+
+
 async def get_add_to_cart_keyboard(
     product_id: int, callback_data: ProductFilter
 ):
@@ -307,9 +351,7 @@ async def get_start_order_keyboard(invoice_link):
     return keyboard.as_markup()
 
 
-async def get_to_main_menu_keyboard():
-    """Инлайн кнопка возврата на главное меню."""
-
+def _build_to_main_menu_keyboard():
     buttons = [
         [
             InlineKeyboardButton(
@@ -321,3 +363,15 @@ async def get_to_main_menu_keyboard():
     keyboard = InlineKeyboardBuilder(markup=buttons)
 
     return keyboard.as_markup()
+
+
+async def get_to_main_menu_keyboard():
+    """Инлайн кнопка возврата на главное меню."""
+
+    return TO_MAIN_MENU_KEYBOARD
+
+
+# Статичные клавиатуры собираются один раз при импорте.
+SUBSCRIPTION_KEYBOARD = _build_subscription_keyboard()
+MAIN_MENU_KEYBOARD = _build_main_menu_keyboard()
+TO_MAIN_MENU_KEYBOARD = _build_to_main_menu_keyboard()
@@ -3,6 +3,7 @@ SUBSCRIBE_TO_OUR_CHANNELS = """Подпишись на канал и групп
 OUR_CHANNEL = "Наш канал 👀"
 OUR_GROUP = "Наша группа 👥"
 CHECK_SUBSCRIBE_TEXT = "Я подписалась/подписался 😌"
+NOT_SUBSCRIBED_YET = "Подписка на канал и группу пока не найдена 🙏🏼"
 RETURN = "↖️ Вернуться"
 SELECT_CATEGORY = "Выберите категорию ниже 👇🏼"
 SELECT_SUBCATEGORY = "Выберите категорию ниже 👇🏼"
@@ -28,3 +29,17 @@ FAQ_TEXT = """Часто задаваемые вопросы:
 2. Начните вводить вопрос из спика
 3. Выберите предложенный вариант
 """
+PRE_CHECKOUT_CART_EMPTY = "Корзина пуста или товары больше недоступны."
+PRE_CHECKOUT_PRICE_CHANGED = (
+    "Состав или цены корзины изменились. Оформите заказ заново."
+)
+PRE_CHECKOUT_TIMEOUT_ERROR = "Не удалось проверить заказ, попробуйте ещё раз."
+PRE_CHECKOUT_ERROR = "Не удалось проверить заказ, попробуйте позже."
+ADMIN_NEW_ORDER = """🛒 Новый заказ №{order_id}
+Покупатель: {user_id}
+Адрес: {address}
+
+{items}
+
+Итого: {total} р."""
+OUTDATED_MENU = "Это меню устарело, откройте главное меню."
@@ -1,30 +1,126 @@
 import asyncio
 
-from config import bot, dp, logger
+from aiohttp import web
+from config import (
+    BOT_MODE,
+    CATALOG_REFRESH_INTERVAL,
+    DB_POOL_METRICS_INTERVAL,
+    FAQ_REFRESH_INTERVAL,
+    ORDERS_EXPORT_INTERVAL,
+    OUTBOX_POLL_INTERVAL,
+    UPDATES_CONCURRENCY,
+    WEBHOOK_BASE_URL,
+    WEBHOOK_HOST,
+    WEBHOOK_PATH,
+    WEBHOOK_PORT,
+    WEBHOOK_SECRET,
+    bot,
+    dp,
+    logger,
+)
+from database.engine import log_pool_metrics
 from handlers import get_handlers_router
 from keyboards.default_commands import set_default_commands
-from middlewares import register_middlewares
+from middlewares import register_middlewares, register_request_middlewares
+from services import (
+    catalog,
+    faq,
+    import_orders_from_excel,
+    order_journal,
+    outbox,
+    run_excel_exporter,
+)
+from webhook import create_app
+
+background_tasks: set[asyncio.Task] = set()
 
 
 async def on_startup() -> None:
 
     logger.info("Starting bot")
-    register_middlewares(dp)
-    dp.include_router(get_handlers_router())
+    try:
+        await catalog.refresh()
+    except Exception:
+        # до загрузки снимка каталог отдаётся постранично из БД
+        logger.exception("Не удалось загрузить каталог при старте")
+    try:
+        await faq.refresh()
+    except Exception:
+        logger.exception("Не удалось загрузить FAQ при старте")
+    background_tasks.add(
+        asyncio.create_task(catalog.run_refresher(CATALOG_REFRESH_INTERVAL))
+    )
+    background_tasks.add(
+        asyncio.create_task(faq.run_refresher(FAQ_REFRESH_INTERVAL))
+    )
+    # до журнала и outbox: иначе перенос не увидит записанные заказы,
+    # а экспорт перезапишет старый Excel. Ошибка останавливает запуск,
+    # чтобы история заказов не пропала.
+    imported = await asyncio.to_thread(import_orders_from_excel)
+    if imported:
+        logger.info("Заказы из Excel перенесены в журнал", orders=imported)
+    background_tasks.add(order_journal.start())
+    background_tasks.add(asyncio.create_task(outbox.run(OUTBOX_POLL_INTERVAL)))
+    background_tasks.add(
+        asyncio.create_task(run_excel_exporter(ORDERS_EXPORT_INTERVAL))
+    )
+    background_tasks.add(
+        asyncio.create_task(log_pool_metrics(DB_POOL_METRICS_INTERVAL))
+    )
     await set_default_commands(bot)
 
 
 async def on_shutdown() -> None:
+    for task in background_tasks:
+        task.cancel()
+    await order_journal.close()
     await dp.storage.close()
     await dp.fsm.storage.close()
     logger.info("bot stopped")
 
 
+async def on_webhook_startup() -> None:
+    if not WEBHOOK_BASE_URL:
+        logger.info("WEBHOOK_BASE_URL не задан — setWebhook не вызывается")
+        return
+
+    await bot.set_webhook(
+        url=f"{WEBHOOK_BASE_URL}{WEBHOOK_PATH}",
+        secret_token=WEBHOOK_SECRET,
+        allowed_updates=dp.resolve_used_update_types(),
+        max_connections=min(UPDATES_CONCURRENCY, 100),
+    )
+    logger.info("Webhook установлен", url=f"{WEBHOOK_BASE_URL}{WEBHOOK_PATH}")
+
+
 async def main():
+    await bot.delete_webhook()
+    await dp.start_polling(
+        bot,
+        allowed_updates=dp.resolve_used_update_types(),
+        tasks_concurrency_limit=UPDATES_CONCURRENCY,
+    )
+
+
+def setup_dispatcher() -> None:
+    # Роутеры подключаются до запуска: по ним считается allowed_updates,
+    # иначе Telegram не пришлёт апдейты chat_member.
+    register_middlewares(dp)
+    register_request_middlewares(bot)
+    dp.include_router(get_handlers_router())
     dp.startup.register(on_startup)
     dp.shutdown.register(on_shutdown)
-    await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    setup_dispatcher()
+    if BOT_MODE == "webhook":
+        dp.startup.register(on_webhook_startup)
+        web.run_app(
+            create_app(dp, bot),
+            host=WEBHOOK_HOST,
+            port=WEBHOOK_PORT,
+            print=None,
+        )
+    else:
+        asyncio.run(main())
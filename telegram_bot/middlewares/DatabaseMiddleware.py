@@ -1,14 +1,48 @@
-from typing import Any, Awaitable, Callable, Dict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
 
-from aiogram import BaseMiddleware
+from aiogram import BaseMiddleware, Router
 from aiogram.types import TelegramObject
 
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
-class DataBaseSession(BaseMiddleware):
+class LazySession:
+    """
+    Прокси AsyncSession: сессия создаётся при первом обращении к ней,
+    поэтому обработчики, не работающие с БД, её не открывают.
+    """
+
+    __slots__ = ("_session_pool", "_session")
+
     def __init__(self, session_pool: async_sessionmaker):
+        self._session_pool = session_pool
+        self._session: Optional[AsyncSession] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._session_pool()
+        return getattr(self._session, name)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class DataBaseSession(BaseMiddleware):
+    """
+    Передаёт в обработчик ленивую сессию БД.
+
+    Роутеры из skip_routers сессию не получают вовсе.
+    """
+
+    def __init__(
+        self,
+        session_pool: async_sessionmaker,
+        skip_routers: Iterable[Router] = (),
+    ):
         self.session_pool = session_pool
+        self.skip_routers = frozenset(skip_routers)
 
     async def __call__(
         self,
@@ -16,6 +50,12 @@ class DataBaseSession(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        async with self.session_pool() as session:
-            data["session"] = session
+        if data.get("event_router") in self.skip_routers:
+            return await handler(event, data)
+
+        session = LazySession(self.session_pool)
+        data["session"] = session
+        try:
             return await handler(event, data)
+        finally:
+            await session.close()
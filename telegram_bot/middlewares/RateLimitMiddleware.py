@@ -0,0 +1,208 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    CopyMessage,
+    CopyMessages,
+    EditMessageCaption,
+    EditMessageLiveLocation,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    ForwardMessage,
+    ForwardMessages,
+    Response,
+    SendAnimation,
+    SendAudio,
+    SendContact,
+    SendDice,
+    SendDocument,
+    SendInvoice,
+    SendLocation,
+    SendMediaGroup,
+    SendMessage,
+    SendPaidMedia,
+    SendPhoto,
+    SendPoll,
+    SendSticker,
+    SendVenue,
+    SendVideo,
+    SendVideoNote,
+    SendVoice,
+    StopMessageLiveLocation,
+    StopPoll,
+    TelegramMethod,
+)
+from aiogram.methods.base import TelegramType
+from config import logger
+from constants import (
+    TELEGRAM_BULK_RESERVE,
+    TELEGRAM_CHAT_BUCKETS_SIZE,
+    TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_GROUP_CHAT_BURST,
+    TELEGRAM_GROUP_CHAT_RATE,
+    TELEGRAM_PRIVATE_CHAT_BURST,
+    TELEGRAM_PRIVATE_CHAT_RATE,
+    TELEGRAM_RETRY_ATTEMPTS,
+)
+from utils import LRUCache, TokenBucket
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+# методы, которые публикуют или меняют сообщения в чате: именно на них
+# действуют лимиты Telegram на сообщения в чат; ответы на callback,
+# удаление сообщений, действия в чате и чтения не ограничиваются
+RATE_LIMITED_METHODS = (
+    SendMessage,
+    SendPhoto,
+    SendVideo,
+    SendAnimation,
+    SendAudio,
+    SendDocument,
+    SendVoice,
+    SendVideoNote,
+    SendSticker,
+    SendMediaGroup,
+    SendLocation,
+    SendVenue,
+    SendContact,
+    SendPoll,
+    SendDice,
+    SendInvoice,
+    SendPaidMedia,
+    CopyMessage,
+    CopyMessages,
+    ForwardMessage,
+    ForwardMessages,
+    EditMessageText,
+    EditMessageCaption,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+    EditMessageLiveLocation,
+    StopMessageLiveLocation,
+    StopPoll,
+)
+
+_bulk_sending: ContextVar[bool] = ContextVar("bulk_sending", default=False)
+
+
+@contextmanager
+def bulk_sending() -> Iterator[None]:
+    """
+    Запросы внутри блока считаются массовой рассылкой: они уступают
+    ответам пользователям и не расходуют резерв глобального лимита.
+    """
+    token = _bulk_sending.set(True)
+    try:
+        yield
+    finally:
+        _bulk_sending.reset(token)
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Планировщик исходящих запросов сессии бота.
+
+    Запросы в чат проходят через глобальное ведро токенов и ведро чата
+    (в личке и в группах лимиты Telegram разные). Ответы пользователям
+    обслуживаются раньше массовых рассылок. При flood control запрос
+    повторяется после retry_after, а ведро на это время закрывается.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = TELEGRAM_GLOBAL_RATE,
+        bulk_reserve: float = TELEGRAM_BULK_RESERVE,
+        retry_attempts: int = TELEGRAM_RETRY_ATTEMPTS,
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.bulk_reserve = global_rate * bulk_reserve
+        self.retry_attempts = retry_attempts
+        self.chat_buckets = LRUCache(maxsize=TELEGRAM_CHAT_BUCKETS_SIZE)
+        self.interactive_waiting = 0
+
+    def _chat_bucket(self, method: TelegramMethod) -> Optional[TokenBucket]:
+        if not isinstance(method, RATE_LIMITED_METHODS):
+            return None
+        # у inline-сообщений (edit по inline_message_id) чата нет
+        chat_id = method.chat_id
+        if chat_id is None:
+            return None
+
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            if isinstance(chat_id, int) and chat_id > 0:
+                bucket = TokenBucket(
+                    TELEGRAM_PRIVATE_CHAT_RATE, TELEGRAM_PRIVATE_CHAT_BURST
+                )
+            else:
+                bucket = TokenBucket(
+                    TELEGRAM_GROUP_CHAT_RATE, TELEGRAM_GROUP_CHAT_BURST
+                )
+            self.chat_buckets.set(chat_id, bucket)
+        return bucket
+
+    async def _acquire(self, chat_bucket: TokenBucket, bulk: bool) -> None:
+        while True:
+            if bulk:
+                delay = max(
+                    self.global_bucket.delay(self.bulk_reserve),
+                    chat_bucket.delay(),
+                )
+                if self.interactive_waiting:
+                    delay = max(delay, 1 / self.global_bucket.rate)
+            else:
+                delay = max(self.global_bucket.delay(), chat_bucket.delay())
+
+            if delay <= 0:
+                self.global_bucket.consume()
+                chat_bucket.consume()
+                return
+            await asyncio.sleep(delay)
+
+    async def _wait_turn(self, chat_bucket: TokenBucket) -> None:
+        if _bulk_sending.get():
+            await self._acquire(chat_bucket, bulk=True)
+            return
+
+        self.interactive_waiting += 1
+        try:
+            await self._acquire(chat_bucket, bulk=False)
+        finally:
+            self.interactive_waiting -= 1
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_bucket = self._chat_bucket(method)
+
+        for attempt in range(self.retry_attempts + 1):
+            if chat_bucket is not None:
+                await self._wait_turn(chat_bucket)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt == self.retry_attempts:
+                    raise
+                logger.warning(
+                    "Flood control — повтор запроса",
+                    method=type(method).__name__,
+                    chat_id=getattr(method, "chat_id", None),
+                    retry_after=e.retry_after,
+                    attempt=attempt + 1,
+                )
+                if chat_bucket is None:
+                    await asyncio.sleep(e.retry_after)
+                else:
+                    chat_bucket.pause(e.retry_after)
@@ -0,0 +1,35 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+
+class SubscriptionMiddleware(BaseMiddleware):
+    """
+    Пропускает к обработчикам с флагом subscription_required только
+    подписчиков канала и группы, остальным отправляет просьбу подписаться.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if not get_flag(data, "subscription_required"):
+            return await handler(event, data)
+
+        from services.subscriptions_check import (
+            is_user_subscribed,
+            send_subscription_request,
+        )
+
+        if await is_user_subscribed(event.from_user.id):
+            return await handler(event, data)
+
+        if isinstance(event, CallbackQuery):
+            await event.answer()
+            event = event.message
+        if isinstance(event, Message):
+            await send_subscription_request(event)
@@ -1,8 +1,28 @@
-from aiogram import Dispatcher
+from aiogram import Bot, Dispatcher
 
 
 def register_middlewares(dp: Dispatcher) -> None:
     from .DatabaseMiddleware import DataBaseSession
+    from .SubscriptionMiddleware import SubscriptionMiddleware
     from database.engine import session_maker
+    from handlers import faq_handler
 
-    dp.update.middleware(DataBaseSession(session_pool=session_maker))
+    # Внутренний middleware на каждом типе событий: срабатывает только
+    # для найденного обработчика и знает его роутер (event_router).
+    db_session = DataBaseSession(
+        session_pool=session_maker,
+        skip_routers=(faq_handler.router,),
+    )
+    for event_name, observer in dp.observers.items():
+        if event_name not in ("update", "error"):
+            observer.middleware(db_session)
+
+    subscription = SubscriptionMiddleware()
+    dp.message.middleware(subscription)
+    dp.callback_query.middleware(subscription)
+
+
+def register_request_middlewares(bot: Bot) -> None:
+    from .RateLimitMiddleware import RateLimitMiddleware
+
+    bot.session.middleware(RateLimitMiddleware())
@@ -1,9 +1,35 @@
 from .subscriptions_check import subscriptions_check
-from .create_youkassa_invoice_link import create_youkassa_invoice_link
-from .append_order_to_excel import append_order_to_excel
+from .create_youkassa_invoice_link import (
+    create_youkassa_invoice_link,
+    forget_invoice_link,
+    get_cart_key,
+)
+from .order_journal import append_order_to_journal, order_journal
+from .export_orders_to_excel import (
+    import_orders_from_excel,
+    run_excel_exporter,
+)
+from .outbox import outbox
+from .outbox_handlers import ORDER_PAID_EVENTS
+from .catalog import CategoryRecord, ProductRecord, catalog
+from .faq import faq
+from .product_photo import get_product_photo, save_product_photo_file_id
 
 __all__ = (
     "subscriptions_check",
     "create_youkassa_invoice_link",
-    "append_order_to_excel",
+    "forget_invoice_link",
+    "get_cart_key",
+    "append_order_to_journal",
+    "order_journal",
+    "import_orders_from_excel",
+    "run_excel_exporter",
+    "outbox",
+    "ORDER_PAID_EVENTS",
+    "CategoryRecord",
+    "ProductRecord",
+    "catalog",
+    "faq",
+    "get_product_photo",
+    "save_product_photo_file_id",
 )
@@ -0,0 +1,285 @@
+import asyncio
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from config import logger
+from constants import BUTTONS_PER_PAGE
+from database import (
+    get_all_categories,
+    get_all_products,
+    get_catalog_version,
+    get_categories_page,
+    get_category_breadcrumbs,
+    get_category_subtree,
+    get_product,
+    get_products_page,
+    get_subtree_products,
+)
+from database.engine import session_maker
+from keyboards.keyboards import catalog_keyboards
+from utils import DBPagination, Pagination
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryRecord:
+    """Категория или подкатегория из снимка каталога."""
+
+    id: int
+    name: str
+    parent_id: Optional[int]
+
+
+@dataclass(frozen=True, slots=True)
+class ProductRecord:
+    """Товар из снимка каталога."""
+
+    id: int
+    category_id: int
+    name: str
+    description: Optional[str]
+    price: Decimal
+    photo: Optional[str]
+    photo_hash: str
+    telegram_file_id: str
+
+
+class CatalogSnapshot:
+    """
+    Неизменяемый снимок каталога с индексами по id и по родителю.
+    Списки внутри индексов уже отсортированы по имени.
+    """
+
+    __slots__ = (
+        "version",
+        "_categories",
+        "_products",
+        "_children",
+        "_category_products",
+    )
+
+    def __init__(
+        self,
+        version: int,
+        categories: Iterable[CategoryRecord],
+        products: Iterable[ProductRecord],
+    ):
+        self.version = version
+        self._categories: Dict[int, CategoryRecord] = {}
+        self._products: Dict[int, ProductRecord] = {}
+        children: Dict[Optional[int], list] = {}
+        category_products: Dict[int, list] = {}
+
+        for category in categories:
+            self._categories[category.id] = category
+            children.setdefault(category.parent_id, []).append(category)
+        for product in products:
+            self._products[product.id] = product
+            category_products.setdefault(product.category_id, []).append(
+                product
+            )
+
+        self._children: Dict[Optional[int], Tuple[CategoryRecord, ...]] = {
+            key: tuple(value) for key, value in children.items()
+        }
+        self._category_products: Dict[int, Tuple[ProductRecord, ...]] = {
+            key: tuple(value) for key, value in category_products.items()
+        }
+
+    def get_categories(self) -> Tuple[CategoryRecord, ...]:
+        return self._children.get(None, ())
+
+    def get_subcategories(
+        self, category_id: int
+    ) -> Tuple[CategoryRecord, ...]:
+        return self._children.get(category_id, ())
+
+    def get_products(self, subcategory_id: int) -> Tuple[ProductRecord, ...]:
+        return self._category_products.get(subcategory_id, ())
+
+    def get_category(self, category_id: int) -> Optional[CategoryRecord]:
+        return self._categories.get(category_id)
+
+    def get_product(self, product_id: int) -> Optional[ProductRecord]:
+        return self._products.get(product_id)
+
+    def get_subtree(self, category_id: int) -> Tuple[CategoryRecord, ...]:
+        """Категория и все её потомки в порядке обхода в глубину."""
+
+        category = self._categories.get(category_id)
+        if category is None:
+            return ()
+        subtree = []
+        stack = [category]
+        while stack:
+            category = stack.pop()
+            subtree.append(category)
+            stack.extend(reversed(self._children.get(category.id, ())))
+        return tuple(subtree)
+
+    def get_subtree_products(
+        self, category_id: int
+    ) -> Tuple[ProductRecord, ...]:
+        """Товары категории и её подкатегорий любой глубины по имени."""
+
+        products = [
+            product
+            for category in self.get_subtree(category_id)
+            for product in self._category_products.get(category.id, ())
+        ]
+        return tuple(sorted(products, key=lambda p: (p.name, p.id)))
+
+    def get_breadcrumbs(self, category_id: int) -> Tuple[CategoryRecord, ...]:
+        """Цепочка категорий от корня до заданной."""
+
+        breadcrumbs = []
+        category = self._categories.get(category_id)
+        while category is not None:
+            breadcrumbs.append(category)
+            category = self._categories.get(category.parent_id)
+        return tuple(reversed(breadcrumbs))
+
+
+class Catalog:
+    """
+    Держатель актуального снимка каталога.
+
+    Снимок перечитывается целиком, только когда меняется версия каталога
+    в БД (её увеличивает админка), и подменяется одной операцией
+    присваивания, поэтому обработчики читают его без блокировок.
+    """
+
+    def __init__(self):
+        self.snapshot = CatalogSnapshot(version=-1, categories=(), products=())
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.snapshot.version >= 0
+
+    async def get_page(
+        self,
+        level: str,
+        parent_id: Optional[int] = None,
+        page: int = 1,
+        per_page: int = BUTTONS_PER_PAGE,
+    ) -> Pagination:
+        """
+        Страница уровня каталога (category, subcategory, product).
+
+        Берётся из снимка, а пока он не загружен — одной страницей из БД.
+        """
+
+        snapshot = self.snapshot
+        if self.is_loaded:
+            if level == "product":
+                items = snapshot.get_products(parent_id)
+            elif level == "subcategory":
+                items = snapshot.get_subcategories(parent_id)
+            else:
+                items = snapshot.get_categories()
+            return Pagination(
+                level, items, page, per_page, version=snapshot.version
+            )
+
+        async with session_maker() as session:
+            if level == "product":
+                items, total = await get_products_page(
+                    parent_id, page, per_page, session
+                )
+            else:
+                items, total = await get_categories_page(
+                    parent_id if level == "subcategory" else None,
+                    page,
+                    per_page,
+                    session,
+                )
+        return DBPagination(level, items, total, page, per_page)
+
+    async def get_product(self, product_id: int) -> Optional[ProductRecord]:
+        """Товар из снимка, а пока он не загружен — из БД."""
+
+        if self.is_loaded:
+            return self.snapshot.get_product(product_id)
+
+        async with session_maker() as session:
+            row = await get_product(product_id, session)
+        return ProductRecord(*row) if row else None
+
+    async def get_subtree(
+        self, category_id: int
+    ) -> Tuple[CategoryRecord, ...]:
+        """Категория с потомками из снимка, а пока он не загружен — из БД."""
+
+        if self.is_loaded:
+            return self.snapshot.get_subtree(category_id)
+
+        async with session_maker() as session:
+            rows = await get_category_subtree(category_id, session)
+        return tuple(CategoryRecord(*row) for row in rows)
+
+    async def get_subtree_products(
+        self, category_id: int
+    ) -> Tuple[ProductRecord, ...]:
+        """Товары поддерева из снимка, а пока он не загружен — из БД."""
+
+        if self.is_loaded:
+            return self.snapshot.get_subtree_products(category_id)
+
+        async with session_maker() as session:
+            rows = await get_subtree_products(category_id, session)
+        return tuple(ProductRecord(*row) for row in rows)
+
+    async def get_breadcrumbs(
+        self, category_id: int
+    ) -> Tuple[CategoryRecord, ...]:
+        """Цепочка предков из снимка, а пока он не загружен — из БД."""
+
+        if self.is_loaded:
+            return self.snapshot.get_breadcrumbs(category_id)
+
+        async with session_maker() as session:
+            rows = await get_category_breadcrumbs(category_id, session)
+        return tuple(CategoryRecord(*row) for row in rows)
+
+    async def refresh(self) -> bool:
+        """Перечитывает каталог, если изменилась его версия."""
+
+        async with session_maker() as session:
+            # один снимок БД на проверку версии и обе выгрузки
+            await session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ"}
+            )
+            version = await get_catalog_version(session)
+            if version == self.snapshot.version:
+                return False
+
+            categories = await get_all_categories(session)
+            products = await get_all_products(session)
+
+        self.snapshot = CatalogSnapshot(
+            version=version,
+            categories=(CategoryRecord(*row) for row in categories),
+            products=(ProductRecord(*row) for row in products),
+        )
+        # клавиатуры прежней версии больше не запрашиваются
+        catalog_keyboards.clear()
+        logger.info(
+            "Каталог загружен",
+            version=version,
+            categories=len(categories),
+            products=len(products),
+        )
+        return True
+
+    async def run_refresher(self, interval: float) -> None:
+        """Фоновая задача периодической проверки версии каталога."""
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Ошибка обновления каталога")
+
+
+catalog = Catalog()
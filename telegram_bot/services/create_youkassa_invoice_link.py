@@ -1,8 +1,42 @@
+from typing import Hashable, Iterable, Optional
+
 from aiogram.types import LabeledPrice
 from config import YOO_TOKEN, bot, logger
+from constants import INVOICE_LINK_CACHE_SIZE, INVOICE_LINK_TTL
+from database.models import CartItem
+from utils import LRUCache
+
+# user_id -> (состав корзины, сумма в копейках, ссылка на оплату)
+invoice_links = LRUCache(maxsize=INVOICE_LINK_CACHE_SIZE, ttl=INVOICE_LINK_TTL)
+
+
+def get_cart_key(cart_items: Iterable[CartItem]) -> tuple:
+    """Ключ состава корзины: товары, количества и текущие цены."""
+    return tuple(
+        sorted(
+            (item.product_id, item.quantity, item.product.price)
+            for item in cart_items
+        )
+    )
+
+
+def forget_invoice_link(user_id: int) -> None:
+    """Сбрасывает ссылку на оплату после изменения корзины."""
+    invoice_links.pop(user_id)
 
 
-async def create_youkassa_invoice_link(price, user_id):
+async def create_youkassa_invoice_link(
+    price, user_id, cart_key: Optional[Hashable] = None
+):
+    amount = int(price * 100)
+    if cart_key is not None:
+        cached = invoice_links.get(user_id)
+        if cached and cached[:2] == (cart_key, amount):
+            logger.info(
+                f"Ссылка на оплату для user_id={user_id} взята из кэша"
+            )
+            return cached[2]
+
     logger.info(
         f"Создание ссылки на оплату YouKassa для user_id={user_id} с суммой {price} руб."
     )
@@ -10,7 +44,7 @@ async def create_youkassa_invoice_link(price, user_id):
     description = "Оплата товаров в корзине"
     price_obj = LabeledPrice(
         label=description,
-        amount=int(price * 100),
+        amount=amount,
     )
 
     try:
@@ -25,9 +59,12 @@ async def create_youkassa_invoice_link(price, user_id):
             is_flexible=False,  # True если стоимость зависит от доставки
         )
         logger.info(f"Ссылка на оплату успешно создана для user_id={user_id}")
-        return invoice_link
     except Exception as e:
         logger.error(
             f"Ошибка при создании ссылки на оплату для user_id={user_id}: {e}"
         )
         raise
+
+    if cart_key is not None:
+        invoice_links.set(user_id, (cart_key, amount, invoice_link))
+    return invoice_link
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import os
+import shutil
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import EXCEL_FILE, ORDERS_JOURNAL_FILE, logger
+from openpyxl import Workbook, load_workbook
+
+HEADERS = [
+    "Дата",
+    "User ID",
+    "Страна",
+    "Город",
+    "Улица",
+    "Индекс",
+    "Товары",
+    "Общая сумма (₽)",
+]
+
+
+def read_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """Построчно читает журнал, пропуская недописанную при сбое строку."""
+    with open(path, encoding="utf-8") as file:
+        for number, line in enumerate(file, start=1):
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(
+                    "Повреждённая строка журнала заказов пропущена",
+                    line=number,
+                )
+
+
+def order_to_row(order: Dict[str, Any]) -> List[Any]:
+    # у заказов, перенесённых из старого Excel, товары уже строкой
+    items_str = order.get("items_text") or "\n".join(
+        f"{item['name']} (x{item['quantity']}) — "
+        f"{Decimal(str(item['price'])):.2f}₽"
+        for item in order["items"]
+    )
+    return [
+        order["created_at"],
+        order["user_id"],
+        order["country"],
+        order["city"],
+        order["street"],
+        order["post_code"],
+        items_str,
+        Decimal(str(order["total"])),
+    ]
+
+
+def export_orders_to_excel(
+    journal_path: str = ORDERS_JOURNAL_FILE, excel_path: str = EXCEL_FILE
+) -> int:
+    """
+    Строит XLSX из журнала потоково (write-only) во временный файл
+    и атомарно подменяет им прежний. Возвращает число заказов.
+    """
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(HEADERS)
+    count = 0
+    # outbox доставляет «хотя бы один раз», повторы заказа пропускаются
+    seen_orders = set()
+    for order in read_journal(journal_path):
+        order_id = order.get("order_id")
+        if order_id is not None:
+            if order_id in seen_orders:
+                continue
+            seen_orders.add(order_id)
+        ws.append(order_to_row(order))
+        count += 1
+
+    tmp_path = f"{excel_path}.tmp"
+    wb.save(tmp_path)
+    os.replace(tmp_path, excel_path)
+    return count
+
+
+def _has_imported_orders(journal_path: str) -> bool:
+    """Есть ли в журнале заказы, уже перенесённые из старого Excel."""
+    if not os.path.exists(journal_path):
+        return False
+    return any("items_text" in order for order in read_journal(journal_path))
+
+
+def import_orders_from_excel(
+    excel_path: str = EXCEL_FILE, journal_path: str = ORDERS_JOURNAL_FILE
+) -> int:
+    """
+    Однократно переносит заказы из Excel, который раньше вёл бот,
+    в начало журнала, чтобы экспорт их не потерял.
+
+    Вызывается при старте до того, как в журнал начнут писать.
+    Перенос отмечается файлом-маркером рядом с журналом: после него
+    EXCEL_FILE строится из журнала и повторно не читается.
+    """
+
+    marker_path = f"{journal_path}.imported"
+    if os.path.exists(marker_path):
+        return 0
+
+    count = 0
+    # заказы могли быть перенесены до сбоя, помешавшего создать маркер
+    if os.path.exists(excel_path) and not _has_imported_orders(journal_path):
+        os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
+        wb = load_workbook(excel_path, read_only=True)
+        with open(f"{journal_path}.tmp", "w", encoding="utf-8") as file:
+            for row in wb.active.iter_rows(min_row=2, values_only=True):
+                created_at, user_id, country, city, street, post_code = row[:6]
+                order = {
+                    "created_at": str(created_at),
+                    "user_id": user_id,
+                    "country": country or "",
+                    "city": city or "",
+                    "street": street or "",
+                    "post_code": post_code or "",
+                    "items": [],
+                    "items_text": row[6] or "",
+                    "total": row[7],
+                }
+                file.write(json.dumps(order, ensure_ascii=False, default=str))
+                file.write("\n")
+                count += 1
+            # заказы, записанные в журнал до переноса, идут следом
+            if os.path.exists(journal_path):
+                with open(journal_path, encoding="utf-8") as journal:
+                    shutil.copyfileobj(journal, file)
+            file.flush()
+            os.fsync(file.fileno())
+        wb.close()
+        os.replace(f"{journal_path}.tmp", journal_path)
+
+    with open(marker_path, "w") as marker:
+        os.fsync(marker.fileno())
+    return count
+
+
+def _journal_state(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+async def run_excel_exporter(interval: float) -> None:
+    """
+    Фоновая задача: пересобирает XLSX в отдельном потоке,
+    если журнал изменился с прошлого экспорта.
+    """
+
+    exported_state = _journal_state(ORDERS_JOURNAL_FILE)
+    while True:
+        await asyncio.sleep(interval)
+        state = _journal_state(ORDERS_JOURNAL_FILE)
+        if state is None or state == exported_state:
+            continue
+        try:
+            count = await asyncio.to_thread(export_orders_to_excel)
+        except Exception:
+            logger.exception("Ошибка экспорта заказов в Excel")
+            continue
+        exported_state = state
+        logger.info("Заказы выгружены в Excel", orders=count)
@@ -0,0 +1,146 @@
+import asyncio
+import html
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from aiogram.types import InlineQueryResultArticle, InputTextMessageContent
+from config import logger
+from constants import FAQ_MAX_PREFIX_LENGTH, FAQ_MAX_RESULTS
+from database import get_all_faqs, get_faq_fingerprint
+from database.engine import session_maker
+
+TOKEN_RE = re.compile(r"\w+")
+
+# вес совпадения: слово вопроса целиком, начало слова вопроса, слово ответа
+QUESTION_WORD_WEIGHT = 4
+QUESTION_PREFIX_WEIGHT = 2
+ANSWER_WEIGHT = 1
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower().replace("ё", "е"))
+
+
+@dataclass(frozen=True, slots=True)
+class FaqRecord:
+    """Вопрос FAQ из БД."""
+
+    id: int
+    question: str
+    answer: str
+
+
+class FaqIndex:
+    """
+    Неизменяемый поисковый индекс FAQ: префикс слова -> {номер вопроса: вес}.
+    Результаты для inline-ответа собираются один раз при построении.
+    """
+
+    __slots__ = ("fingerprint", "_results", "_prefixes")
+
+    def __init__(self, fingerprint: Tuple, faqs: Iterable[FaqRecord]):
+        self.fingerprint = fingerprint
+        self._results: List[InlineQueryResultArticle] = []
+        self._prefixes: Dict[str, Dict[int, int]] = {}
+
+        for number, faq in enumerate(faqs):
+            self._results.append(
+                InlineQueryResultArticle(
+                    # id постоянен, чтобы Telegram мог кэшировать ответы
+                    id=f"faq{faq.id}",
+                    title=faq.question,
+                    description=faq.answer[:50],
+                    input_message_content=InputTextMessageContent(
+                        message_text=(
+                            f"<b>{html.escape(faq.question)}</b>\n\n"
+                            f"{html.escape(faq.answer)}"
+                        ),
+                        parse_mode="HTML",
+                    ),
+                )
+            )
+            for word in tokenize(faq.answer):
+                self._add(word, number, ANSWER_WEIGHT, ANSWER_WEIGHT)
+            for word in tokenize(faq.question):
+                self._add(
+                    word, number, QUESTION_PREFIX_WEIGHT, QUESTION_WORD_WEIGHT
+                )
+
+    def _add(
+        self, word: str, number: int, prefix_weight: int, word_weight: int
+    ) -> None:
+        for length in range(1, min(len(word), FAQ_MAX_PREFIX_LENGTH) + 1):
+            weight = word_weight if length == len(word) else prefix_weight
+            postings = self._prefixes.setdefault(word[:length], {})
+            if postings.get(number, 0) < weight:
+                postings[number] = weight
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def search(
+        self, query: str, limit: int = FAQ_MAX_RESULTS
+    ) -> List[InlineQueryResultArticle]:
+        """
+        Вопросы, в которых есть все слова запроса (или их начала),
+        по убыванию релевантности, при равной — в порядке из админки.
+        """
+        words = tokenize(query)
+        if not words:
+            return self._results[:limit]
+
+        scores: Dict[int, int] | None = None
+        for word in words:
+            postings = self._prefixes.get(word[:FAQ_MAX_PREFIX_LENGTH])
+            if not postings:
+                return []
+            if scores is None:
+                scores = dict(postings)
+            else:
+                scores = {
+                    number: score + postings[number]
+                    for number, score in scores.items()
+                    if number in postings
+                }
+
+        ranked = sorted(scores, key=lambda number: (-scores[number], number))
+        return [self._results[number] for number in ranked[:limit]]
+
+
+class FaqService:
+    """Держатель индекса FAQ; перестраивает его при изменении таблицы."""
+
+    def __init__(self):
+        self.index = FaqIndex(fingerprint=(), faqs=())
+
+    def search(self, query: str) -> List[InlineQueryResultArticle]:
+        return self.index.search(query)
+
+    async def refresh(self) -> bool:
+        """Перестраивает индекс, если FAQ изменились в БД."""
+
+        async with session_maker() as session:
+            fingerprint = await get_faq_fingerprint(session)
+            if fingerprint == self.index.fingerprint:
+                return False
+            rows = await get_all_faqs(session)
+
+        self.index = FaqIndex(
+            fingerprint=fingerprint, faqs=(FaqRecord(*row) for row in rows)
+        )
+        logger.info("Индекс FAQ перестроен", faqs=len(self.index))
+        return True
+
+    async def run_refresher(self, interval: float) -> None:
+        """Фоновая задача периодической проверки FAQ."""
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Ошибка обновления FAQ")
+
+
+faq = FaqService()
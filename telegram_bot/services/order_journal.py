@@ -0,0 +1,151 @@
+import asyncio
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from aiogram.types import ShippingAddress
+from config import ORDERS_JOURNAL_FILE, logger
+from constants import ORDER_JOURNAL_BATCH_SIZE, ORDER_JOURNAL_FLUSH_INTERVAL
+from database.models import OrderItem
+
+
+class OrderJournal:
+    """
+    Журнал заказов в формате JSON Lines, только дозапись.
+
+    Записи копятся в памяти и сбрасываются на диск пачкой — одной
+    записью в файл и одним fsync в отдельном потоке. append возвращает
+    управление, только когда запись уже на диске.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = ORDER_JOURNAL_FLUSH_INTERVAL,
+        batch_size: int = ORDER_JOURNAL_BATCH_SIZE,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: List[tuple[str, asyncio.Future]] = []
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._tail_checked = False
+
+    async def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((line, future))
+
+        if self._task is None:
+            await self.flush()
+        elif len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        await future
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(
+                    self._write, "".join(line for line, _ in batch)
+                )
+            except Exception as e:
+                logger.exception("Ошибка записи журнала заказов")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    def _write(self, data: str) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if not self._tail_checked:
+            # строку, недописанную при сбое, нужно завершить,
+            # иначе с ней склеится первая новая запись
+            if not self._ends_with_newline():
+                data = "\n" + data
+            self._tail_checked = True
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _ends_with_newline(self) -> bool:
+        try:
+            with open(self.path, "rb") as file:
+                file.seek(0, os.SEEK_END)
+                if not file.tell():
+                    return True
+                file.seek(-1, os.SEEK_END)
+                return file.read(1) == b"\n"
+        except FileNotFoundError:
+            return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), self.flush_interval
+                )
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> asyncio.Task:
+        """Запускает фоновый сброс пачек."""
+        self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def close(self) -> None:
+        """Останавливает фоновый сброс и дописывает остаток."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+
+order_journal = OrderJournal(ORDERS_JOURNAL_FILE)
+
+
+async def append_order_to_journal(
+    user_id: int,
+    shipping_address: ShippingAddress,
+    order_items: List[OrderItem],
+    order_id: Optional[int] = None,
+):
+    items = [
+        {
+            "product_id": item.product_id,
+            "name": item.product.name,
+            "quantity": item.quantity,
+            # цена на момент оформления заказа
+            "price": item.price,
+        }
+        for item in order_items
+        if item.product
+    ]
+    total_price = sum(item["price"] * item["quantity"] for item in items)
+
+    await order_journal.append(
+        {
+            "order_id": order_id,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "user_id": user_id,
+            "country": shipping_address.country_code or "",
+            "city": shipping_address.city or "",
+            "street": shipping_address.street_line1 or "",
+            "post_code": shipping_address.post_code or "",
+            "items": items,
+            "total": round(total_price, 2),
+        }
+    )
+    logger.info(f"Заказ пользователя {user_id} записан в журнал заказов")
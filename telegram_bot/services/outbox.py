@@ -0,0 +1,108 @@
+import asyncio
+from typing import Awaitable, Callable, Dict
+
+from config import logger
+from constants import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LEASE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETRY_BASE,
+    OUTBOX_RETRY_MAX,
+)
+from database import (
+    claim_outbox_events,
+    complete_outbox_event,
+    fail_outbox_event,
+)
+from database.engine import session_maker
+from database.models import OutboxEvent
+from sqlalchemy.ext.asyncio import AsyncSession
+
+OutboxHandler = Callable[[OutboxEvent, AsyncSession], Awaitable[None]]
+
+
+class Outbox:
+    """
+    Фоновый обработчик событий outbox.
+
+    События забираются пачками, каждое передаётся обработчику своего
+    типа. При ошибке событие повторяется с экспоненциальной задержкой,
+    после OUTBOX_MAX_ATTEMPTS попыток помечается как failed. Доставка
+    «хотя бы один раз»: обработчики должны быть идемпотентны
+    по event.idempotency_key либо явно допускать повторы.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, OutboxHandler] = {}
+        self._wakeup = asyncio.Event()
+
+    def handler(
+        self, event_type: str
+    ) -> Callable[[OutboxHandler], OutboxHandler]:
+        def register(handler: OutboxHandler) -> OutboxHandler:
+            self._handlers[event_type] = handler
+            return handler
+
+        return register
+
+    def notify(self) -> None:
+        """Будит воркер сразу после записи новых событий."""
+        self._wakeup.set()
+
+    async def process_batch(self) -> int:
+        async with session_maker() as session:
+            events = await claim_outbox_events(
+                OUTBOX_BATCH_SIZE, OUTBOX_LEASE, session
+            )
+        for event in events:
+            await self._process(event)
+        return len(events)
+
+    async def _process(self, event: OutboxEvent) -> None:
+        try:
+            handler = self._handlers.get(event.event_type)
+            if handler is None:
+                raise LookupError(
+                    f"Нет обработчика для события {event.event_type}"
+                )
+            async with session_maker() as session:
+                await handler(event, session)
+        except Exception as e:
+            retry_in = None
+            if event.attempts < OUTBOX_MAX_ATTEMPTS:
+                retry_in = min(
+                    OUTBOX_RETRY_BASE * 2 ** (event.attempts - 1),
+                    OUTBOX_RETRY_MAX,
+                )
+            logger.exception(
+                "Ошибка обработки события outbox",
+                key=event.idempotency_key,
+                attempts=event.attempts,
+                retry_in=retry_in,
+            )
+            async with session_maker() as session:
+                await fail_outbox_event(event.id, repr(e), retry_in, session)
+            return
+
+        async with session_maker() as session:
+            await complete_outbox_event(event.id, session)
+        logger.info("Событие outbox обработано", key=event.idempotency_key)
+
+    async def run(self, poll_interval: float) -> None:
+        """Фоновая задача: разбирает очередь, затем ждёт notify или таймаут."""
+
+        while True:
+            try:
+                if await self.process_batch():
+                    continue
+            except Exception:
+                logger.exception("Ошибка выборки событий outbox")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), poll_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+outbox = Outbox()
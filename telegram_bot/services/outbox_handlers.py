@@ -0,0 +1,80 @@
+import html
+
+from aiogram.types import ShippingAddress
+from config import ADMIN_CHAT_ID, bot
+from database import get_order_items
+from database.models import OutboxEvent
+from locales.constants_text_ru import ADMIN_NEW_ORDER
+from middlewares.RateLimitMiddleware import bulk_sending
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .order_journal import append_order_to_journal
+from .outbox import outbox
+
+ORDER_PAID_EXPORT = "order_paid.export"
+ORDER_PAID_NOTIFY_ADMINS = "order_paid.notify_admins"
+
+# события, которые пишутся вместе с оплаченным заказом
+ORDER_PAID_EVENTS = (ORDER_PAID_EXPORT,) + (
+    (ORDER_PAID_NOTIFY_ADMINS,) if ADMIN_CHAT_ID else ()
+)
+
+
+@outbox.handler(ORDER_PAID_EXPORT)
+async def export_paid_order(event: OutboxEvent, session: AsyncSession):
+    """Запись заказа в журнал; повторы отсекает экспорт по order_id."""
+
+    order_id = event.payload["order_id"]
+    order_items = await get_order_items(order_id, session)
+    await append_order_to_journal(
+        event.payload["user_id"],
+        ShippingAddress(**event.payload["shipping_address"]),
+        order_items,
+        order_id=order_id,
+    )
+
+
+@outbox.handler(ORDER_PAID_NOTIFY_ADMINS)
+async def notify_admins(event: OutboxEvent, session: AsyncSession):
+    """
+    Сообщение админам о новом заказе.
+
+    Не идемпотентно, повторы допускаются: у Telegram нет ключа
+    дедупликации, а отметку об отправке нельзя записать атомарно
+    с send_message. Если сообщение ушло, но событие не отмечено
+    обработанным (сбой БД, перезапуск бота, истекла аренда
+    OUTBOX_LEASE), оно повторится и админы получат дубль. Для
+    уведомления это лучше, чем потерять заказ (отметка до отправки).
+    """
+
+    order_id = event.payload["order_id"]
+    order_items = await get_order_items(order_id, session)
+    address = ShippingAddress(**event.payload["shipping_address"])
+
+    items = "\n".join(
+        f"• {html.escape(item.product.name)} x {item.quantity} = "
+        f"{item.quantity * item.price} р."
+        for item in order_items
+        if item.product
+    )
+    text = ADMIN_NEW_ORDER.format(
+        order_id=order_id,
+        user_id=event.payload["user_id"],
+        address=html.escape(
+            ", ".join(
+                filter(
+                    None,
+                    [
+                        address.country_code,
+                        address.city,
+                        address.street_line1,
+                        address.post_code,
+                    ],
+                )
+            )
+        ),
+        items=items,
+        total=sum(item.quantity * item.price for item in order_items),
+    )
+    with bulk_sending():
+        await bot.send_message(ADMIN_CHAT_ID, text)
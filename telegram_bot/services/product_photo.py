@@ -0,0 +1,58 @@
+import asyncio
+import os
+from typing import Optional
+
+from aiogram.types import FSInputFile, Message
+from config import logger
+from constants import PHOTO_FILE_ID_CACHE_SIZE
+from database import set_product_photo_file_id
+from services.catalog import ProductRecord
+from sqlalchemy.ext.asyncio import AsyncSession
+from utils import LRUCache
+
+# file_id, полученные после загрузки, пока снимок каталога их не содержит;
+# ключ — (id товара, хэш фото), поэтому смена фото не даёт старый file_id
+uploaded_file_ids = LRUCache(maxsize=PHOTO_FILE_ID_CACHE_SIZE)
+
+
+async def get_product_photo(
+    product: ProductRecord,
+) -> Optional[str | FSInputFile]:
+    """
+    Фото товара для отправки: сохранённый file_id,
+    а если его ещё нет — файл с диска.
+    """
+
+    file_id = product.telegram_file_id or uploaded_file_ids.get(
+        (product.id, product.photo_hash)
+    )
+    if file_id:
+        return file_id
+
+    if product.photo and await asyncio.to_thread(
+        os.path.exists, product.photo
+    ):
+        return FSInputFile(product.photo)
+    return None
+
+
+async def save_product_photo_file_id(
+    product: ProductRecord,
+    message: Message | bool,
+    session: AsyncSession,
+) -> None:
+    """Запоминает file_id, который Telegram вернул после загрузки фото."""
+
+    if not isinstance(message, Message) or not message.photo:
+        return
+    key = (product.id, product.photo_hash)
+    if product.telegram_file_id or key in uploaded_file_ids:
+        return
+
+    # самый большой размер фото
+    file_id = message.photo[-1].file_id
+    uploaded_file_ids.set(key, file_id)
+    await set_product_photo_file_id(
+        product.id, product.photo_hash, file_id, session
+    )
+    logger.info("Сохранён file_id фото товара", product_id=product.id)
@@ -1,56 +1,91 @@
-from typing import Dict
+import asyncio
 
-from aiogram.types import Message
+from aiogram.types import ChatMember, Message
 from config import CHANNEL_ID, GROUP_ID, bot, logger
+from constants import SUBSCRIPTION_CACHE_SIZE, SUBSCRIPTION_CACHE_TTL
 from database.models import Client
 from keyboards import get_subscription_keyboard
 from locales.constants_text_ru import SUBSCRIBE_TO_OUR_CHANNELS
+from utils import LRUCache
+
+# (chat_id, user_id) -> подписан ли пользователь; обновляется также
+# из апдейтов chat_member (бот — администратор канала и группы)
+membership_cache = LRUCache(
+    maxsize=SUBSCRIPTION_CACHE_SIZE, ttl=SUBSCRIPTION_CACHE_TTL
+)
+
+
+def is_chat_member(chat_member: ChatMember) -> bool:
+    return chat_member.status in (
+        "member",
+        "administrator",
+        "creator",
+    ) or bool(getattr(chat_member, "is_member", False))
+
+
+def update_membership(chat_id: int, user_id: int, is_member: bool) -> None:
+    membership_cache.set((chat_id, user_id), is_member)
+
+
+def forget_membership(user_id: int) -> None:
+    for chat_id in (CHANNEL_ID, GROUP_ID):
+        membership_cache.pop((chat_id, user_id))
 
 
 async def subscription_check(chat_id: int, user_id: int) -> bool:
+    is_subscribed = membership_cache.get((chat_id, user_id))
+    if is_subscribed is not None:
+        return is_subscribed
+
     logger.info(f"Проверка подписки пользователя {user_id} на чат {chat_id}")
     try:
         chat_member = await bot.get_chat_member(
             chat_id=chat_id, user_id=user_id
         )
-        is_subscribed = chat_member.status in (
-            "member",
-            "administrator",
-            "creator",
-        )
-        logger.info(
-            f"Пользователь {user_id} подписан на чат {chat_id}: {is_subscribed}"
-        )
-        return is_subscribed
     except Exception as e:
         logger.error(
             f"Ошибка проверки подписки пользователя {user_id} на чат {chat_id}: {e}"
         )
         return False
 
+    is_subscribed = is_chat_member(chat_member)
+    update_membership(chat_id, user_id, is_subscribed)
+    logger.info(
+        f"Пользователь {user_id} подписан на чат {chat_id}: {is_subscribed}"
+    )
+    return is_subscribed
+
+
+async def is_user_subscribed(user_id: int) -> bool:
+    """Проверяет подписку на канал и группу параллельно."""
+    is_channel_member, is_group_member = await asyncio.gather(
+        subscription_check(chat_id=CHANNEL_ID, user_id=user_id),
+        subscription_check(chat_id=GROUP_ID, user_id=user_id),
+    )
+    return is_channel_member and is_group_member
+
+
+async def send_subscription_request(message: Message) -> None:
+    subscription_keyboard = await get_subscription_keyboard()
+    await message.answer(
+        SUBSCRIBE_TO_OUR_CHANNELS, reply_markup=subscription_keyboard
+    )
+
 
 async def subscriptions_check(message: Message, user: Client) -> bool:
     logger.info(
         f"Проверка подписки пользователя {user.telegram_id} на каналы и группы"
     )
-    is_channel_member = await subscription_check(
-        chat_id=CHANNEL_ID, user_id=user.telegram_id
-    )
-    is_group_member = await subscription_check(
-        chat_id=GROUP_ID, user_id=user.telegram_id
-    )
+    is_subscribed = await is_user_subscribed(user.telegram_id)
 
-    if not is_channel_member or not is_group_member:
+    if not is_subscribed:
         logger.info(
             f"Пользователь {user.telegram_id} не подписан на необходимые каналы/группы"
         )
-        subscription_keyboard = await get_subscription_keyboard()
-        await message.answer(
-            SUBSCRIBE_TO_OUR_CHANNELS, reply_markup=subscription_keyboard
-        )
+        await send_subscription_request(message)
     else:
         logger.info(
             f"Пользователь {user.telegram_id} подписан на все необходимые каналы и группы"
         )
 
-    return is_channel_member and is_group_member
+    return is_subscribed
@@ -0,0 +1,27 @@
+"""
+Тесты бота. Запуск из каталога telegram_bot:
+
+    python -m unittest discover -s tests -t .
+
+Переменные окружения ниже нужны только для импорта config; тесты
+не обращаются ни к Telegram, ни к БД.
+"""
+
+import os
+
+for name, value in {
+    "BOT_TOKEN": "123456:TEST-TOKEN-TEST-TOKEN-TEST-TOKEN-TEST",
+    "BOT_NAME": "test_bot",
+    "CHANNEL_ID": "-1001",
+    "CHANNEL_URL": "https://t.me/test_channel",
+    "GROUP_ID": "-1002",
+    "GROUP_URL": "https://t.me/test_group",
+    "YOO_TOKEN": "test",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "test",
+    "LOG_FILE": os.devnull,
+}.items():
+    os.environ.setdefault(name, value)
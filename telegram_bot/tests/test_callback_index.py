@@ -0,0 +1,191 @@
+import unittest
+from typing import Any, Callable, List
+
+from aiogram import F, Router
+from aiogram.dispatcher.event.bases import UNHANDLED, SkipHandler
+from aiogram.types import CallbackQuery, User
+from filters import AddToCartFilter, CategoryFilter, DataFilter, ProductFilter
+from handlers import get_handlers_router
+from handlers.callback_index import IndexedRouter
+
+
+def make_handler(name: str, calls: List[str], skip: bool = False) -> Callable:
+    async def handler(*args: Any, **kwargs: Any) -> str:
+        calls.append(name)
+        if skip:
+            raise SkipHandler()
+        return name
+
+    return handler
+
+
+def build_tree(
+    root: Router, calls: List[str], fallback: bool = False
+) -> Router:
+    """Дерево роутеров со всеми видами ключей индекса."""
+
+    first = Router(name="first")
+    first.callback_query.register(
+        make_handler("menu", calls), DataFilter("menu")
+    )
+    first.callback_query.register(
+        make_handler("category", calls), CategoryFilter.filter()
+    )
+    first.callback_query.register(
+        make_handler("skipped", calls, skip=True), DataFilter("skip")
+    )
+
+    second = Router(name="second")
+    # неиндексируемый фильтр стоит в цепочке раньше точного совпадения
+    second.callback_query.register(
+        make_handler("startswith", calls), F.data.startswith("menu_")
+    )
+    second.callback_query.register(
+        make_handler("menu_extra", calls), DataFilter("menu_extra")
+    )
+    second.callback_query.register(
+        make_handler("skip_fallback", calls), DataFilter("skip")
+    )
+    second.callback_query.register(
+        make_handler("product_one", calls), ProductFilter.filter(F.page == 1)
+    )
+
+    third = Router(name="third")
+    third.callback_query.register(
+        make_handler("product_any", calls), ProductFilter.filter()
+    )
+
+    # общий фильтр подроутера: при обычной цепочке роутер пропускается
+    guarded = Router(name="guarded")
+    guarded.callback_query.filter(F.from_user.id == 1)
+    guarded.callback_query.register(
+        make_handler("cart", calls), AddToCartFilter.filter()
+    )
+    nested = Router(name="nested")
+    nested.callback_query.register(
+        make_handler("nested", calls), DataFilter("nested")
+    )
+    guarded.include_router(nested)
+
+    root.include_routers(first, second, third, guarded)
+    if fallback:
+        # обработчик без фильтров последним, как для устаревших кнопок
+        last = Router(name="last")
+        last.callback_query.register(make_handler("fallback", calls))
+        root.include_router(last)
+    return root
+
+
+class CallbackIndexTests(unittest.IsolatedAsyncioTestCase):
+    """Индекс callback выбирает тот же обработчик, что и цепочка роутеров."""
+
+    CALLBACKS = (
+        "menu",
+        "menu_extra",
+        "menu_other",
+        "skip",
+        CategoryFilter(id=12, page=2).pack(),
+        ProductFilter(id=5, page=1, parent_id=3).pack(),
+        ProductFilter(id=5, page=2, parent_id=3).pack(),
+        AddToCartFilter(id=5).pack(),
+        "nested",
+        "stale:button",
+        "unknown",
+        "",
+    )
+
+    def setUp(self):
+        self.build(fallback=False)
+
+    def build(self, fallback: bool):
+        self.chain_calls: List[str] = []
+        self.index_calls: List[str] = []
+        self.chain = build_tree(Router(), self.chain_calls, fallback)
+        self.index = build_tree(IndexedRouter(), self.index_calls, fallback)
+        self.index.build_index()
+
+    def make_event(self, data: str, user_id: int = 1) -> CallbackQuery:
+        return CallbackQuery(
+            id="1",
+            from_user=User(id=user_id, is_bot=False, first_name="test"),
+            chat_instance="test",
+            data=data,
+        )
+
+    async def assert_same_routing(self, event: CallbackQuery) -> Any:
+        self.chain_calls.clear()
+        self.index_calls.clear()
+        expected = await self.chain.propagate_event("callback_query", event)
+        result = await self.index.propagate_event("callback_query", event)
+        self.assertEqual(result, expected)
+        self.assertEqual(self.index_calls, self.chain_calls)
+        return result
+
+    async def test_matches_chain(self):
+        for data in self.CALLBACKS:
+            for user_id in (1, 2):
+                with self.subTest(data=data, user_id=user_id):
+                    await self.assert_same_routing(
+                        self.make_event(data, user_id)
+                    )
+
+    async def test_exact_key(self):
+        result = await self.assert_same_routing(self.make_event("menu"))
+        self.assertEqual(result, "menu")
+
+    async def test_prefix_key(self):
+        event = self.make_event(
+            ProductFilter(id=5, page=2, parent_id=3).pack()
+        )
+        result = await self.assert_same_routing(event)
+        self.assertEqual(result, "product_any")
+
+    async def test_unindexed_fallback_keeps_order(self):
+        result = await self.assert_same_routing(self.make_event("menu_extra"))
+        self.assertEqual(result, "startswith")
+
+    async def test_skip_handler(self):
+        result = await self.assert_same_routing(self.make_event("skip"))
+        self.assertEqual(result, "skip_fallback")
+        self.assertEqual(self.index_calls, ["skipped", "skip_fallback"])
+
+    async def test_sub_router_filters(self):
+        result = await self.assert_same_routing(
+            self.make_event("nested", user_id=2)
+        )
+        self.assertIs(result, UNHANDLED)
+
+    async def test_unhandled(self):
+        result = await self.assert_same_routing(
+            self.make_event("stale:button")
+        )
+        self.assertIs(result, UNHANDLED)
+        self.assertEqual(self.index_calls, [])
+
+    async def test_fallback_handler(self):
+        self.build(fallback=True)
+        for data in self.CALLBACKS:
+            for user_id in (1, 2):
+                with self.subTest(data=data, user_id=user_id):
+                    await self.assert_same_routing(
+                        self.make_event(data, user_id)
+                    )
+        result = await self.assert_same_routing(
+            self.make_event("stale:button")
+        )
+        self.assertEqual(result, "fallback")
+
+    def test_bot_handlers_are_indexed(self):
+        observer = get_handlers_router().callback_query
+        for data in ("show_main_menu", "check_subscription_to_channels"):
+            with self.subTest(data=data):
+                self.assertTrue(observer.get_candidates(data))
+        self.assertTrue(
+            observer.get_candidates(CategoryFilter(id=1, page=1).pack())
+        )
+        # кнопки прежнего формата попадают в обработчик устаревших
+        candidates = observer.get_candidates("product:5:1:3")
+        self.assertEqual(
+            [entry.handler.callback.__name__ for entry in candidates],
+            ["outdated_callback"],
+        )
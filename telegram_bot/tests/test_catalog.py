@@ -0,0 +1,103 @@
+import unittest
+from dataclasses import astuple
+from decimal import Decimal
+from importlib import import_module
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.catalog import (
+    Catalog,
+    CatalogSnapshot,
+    CategoryRecord,
+    ProductRecord,
+)
+
+# services.catalog в пакете services заслонён экземпляром Catalog
+catalog_module = import_module("services.catalog")
+
+ROOT = CategoryRecord(1, "Одежда", None)
+SHOES = CategoryRecord(2, "Обувь", 1)
+JACKETS = CategoryRecord(3, "Куртки", 1)
+BOOTS = CategoryRecord(4, "Ботинки", 2)
+OTHER = CategoryRecord(5, "Книги", None)
+
+
+def make_product(product_id: int, category_id: int, name: str):
+    return ProductRecord(
+        product_id, category_id, name, "", Decimal("10.00"), "", "", ""
+    )
+
+
+class CatalogSnapshotTreeTests(unittest.TestCase):
+    """Поддерево, его товары и цепочка предков из снимка."""
+
+    def setUp(self):
+        # списки снимка отсортированы по имени, как выгрузка из БД
+        self.snapshot = CatalogSnapshot(
+            version=1,
+            categories=(BOOTS, OTHER, JACKETS, SHOES, ROOT),
+            products=(
+                make_product(1, 4, "Берцы"),
+                make_product(2, 3, "Парка"),
+                make_product(3, 5, "Роман"),
+                make_product(4, 1, "Шарф"),
+            ),
+        )
+
+    def test_subtree(self):
+        self.assertEqual(
+            self.snapshot.get_subtree(1), (ROOT, JACKETS, SHOES, BOOTS)
+        )
+        self.assertEqual(self.snapshot.get_subtree(4), (BOOTS,))
+        self.assertEqual(self.snapshot.get_subtree(100), ())
+
+    def test_subtree_products(self):
+        self.assertEqual(
+            [
+                product.name
+                for product in self.snapshot.get_subtree_products(1)
+            ],
+            ["Берцы", "Парка", "Шарф"],
+        )
+        self.assertEqual(self.snapshot.get_subtree_products(100), ())
+
+    def test_breadcrumbs(self):
+        self.assertEqual(
+            self.snapshot.get_breadcrumbs(4), (ROOT, SHOES, BOOTS)
+        )
+        self.assertEqual(self.snapshot.get_breadcrumbs(1), (ROOT,))
+        self.assertEqual(self.snapshot.get_breadcrumbs(100), ())
+
+
+class CatalogTreeFallbackTests(unittest.IsolatedAsyncioTestCase):
+    """Пока снимок не загружен, дерево читается из БД одним запросом."""
+
+    def setUp(self):
+        patcher = patch.object(catalog_module, "session_maker", MagicMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.catalog = Catalog()
+
+    def patch_query(self, name: str, rows):
+        patcher = patch.object(
+            catalog_module, name, AsyncMock(return_value=rows)
+        )
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    async def test_subtree(self):
+        query = self.patch_query("get_category_subtree", [(1, "Одежда", None)])
+        self.assertEqual(await self.catalog.get_subtree(1), (ROOT,))
+        query.assert_awaited_once()
+
+    async def test_subtree_products(self):
+        product = make_product(1, 4, "Берцы")
+        self.patch_query("get_subtree_products", [astuple(product)])
+        self.assertEqual(
+            await self.catalog.get_subtree_products(1), (product,)
+        )
+
+    async def test_breadcrumbs(self):
+        self.patch_query(
+            "get_category_breadcrumbs", [(1, "Одежда", None), (2, "Обувь", 1)]
+        )
+        self.assertEqual(await self.catalog.get_breadcrumbs(2), (ROOT, SHOES))
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+
+from openpyxl import Workbook
+from services.export_orders_to_excel import (
+    HEADERS,
+    export_orders_to_excel,
+    import_orders_from_excel,
+    read_journal,
+)
+
+LEGACY_ROW = [
+    "2024-01-01 10:00:00",
+    111,
+    "RU",
+    "Москва",
+    "Тверская, 1",
+    "101000",
+    "Товар (x1) — 10.00₽",
+    10,
+]
+
+
+class ImportOrdersFromExcelTests(unittest.TestCase):
+    """Перенос старого Excel в журнал не теряет и не дублирует заказы."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.excel_path = os.path.join(directory.name, "orders.xlsx")
+        self.journal_path = os.path.join(directory.name, "orders.jsonl")
+
+    def write_legacy_excel(self):
+        wb = Workbook()
+        wb.active.append(HEADERS)
+        wb.active.append(LEGACY_ROW)
+        wb.save(self.excel_path)
+
+    def write_journal(self, *orders):
+        with open(self.journal_path, "a", encoding="utf-8") as file:
+            for order in orders:
+                file.write(json.dumps(order, ensure_ascii=False) + "\n")
+
+    def import_orders(self):
+        return import_orders_from_excel(self.excel_path, self.journal_path)
+
+    def get_journal(self):
+        return list(read_journal(self.journal_path))
+
+    def test_keeps_orders_written_before_import(self):
+        self.write_legacy_excel()
+        self.write_journal({"order_id": 5, "items": [], "total": 1})
+
+        self.assertEqual(self.import_orders(), 1)
+        journal = self.get_journal()
+        self.assertEqual(journal[0]["items_text"], LEGACY_ROW[6])
+        self.assertEqual(journal[1]["order_id"], 5)
+
+    def test_runs_once(self):
+        self.write_legacy_excel()
+        self.assertEqual(self.import_orders(), 1)
+        # экспорт перезаписывает Excel уже из журнала
+        export_orders_to_excel(self.journal_path, self.excel_path)
+
+        self.assertEqual(self.import_orders(), 0)
+        self.assertEqual(len(self.get_journal()), 1)
+
+    def test_without_legacy_excel(self):
+        self.assertEqual(self.import_orders(), 0)
+        # Excel, собранный потом из журнала, не считается старым
+        self.write_legacy_excel()
+        self.assertEqual(self.import_orders(), 0)
+
+    def test_imported_before_marker(self):
+        self.write_legacy_excel()
+        self.write_journal({"items_text": LEGACY_ROW[6], "total": 10})
+
+        self.assertEqual(self.import_orders(), 0)
+        self.assertEqual(len(self.get_journal()), 1)
@@ -0,0 +1,82 @@
+import unittest
+from importlib import import_module
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from constants import OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_BASE
+from database.models import OutboxEvent
+from services.outbox import Outbox
+
+# services.outbox в пакете services заслонён экземпляром Outbox
+outbox_module = import_module("services.outbox")
+
+
+def make_event(attempts: int, event_type: str = "test") -> OutboxEvent:
+    return OutboxEvent(
+        id=7,
+        event_type=event_type,
+        payload={},
+        idempotency_key=f"{event_type}:1",
+        attempts=attempts,
+    )
+
+
+class OutboxProcessTests(unittest.IsolatedAsyncioTestCase):
+    """Переходы события: обработано, повтор с задержкой, failed."""
+
+    def setUp(self):
+        for name in (
+            "session_maker",
+            "complete_outbox_event",
+            "fail_outbox_event",
+        ):
+            mock = MagicMock() if name == "session_maker" else AsyncMock()
+            patcher = patch.object(outbox_module, name, mock)
+            setattr(self, name, patcher.start())
+            self.addCleanup(patcher.stop)
+
+        self.outbox = Outbox()
+        self.handler = AsyncMock()
+        self.outbox.handler("test")(self.handler)
+
+    def get_retry_in(self):
+        self.complete_outbox_event.assert_not_awaited()
+        self.fail_outbox_event.assert_awaited_once()
+        event_id, error, retry_in, _ = self.fail_outbox_event.await_args.args
+        self.assertEqual(event_id, 7)
+        return retry_in
+
+    async def test_done(self):
+        await self.outbox._process(make_event(attempts=1))
+        self.handler.assert_awaited_once()
+        self.complete_outbox_event.assert_awaited_once()
+        self.assertEqual(self.complete_outbox_event.await_args.args[0], 7)
+        self.fail_outbox_event.assert_not_awaited()
+
+    async def test_retry_backoff(self):
+        self.handler.side_effect = RuntimeError("send failed")
+        for attempts, expected in (
+            (1, OUTBOX_RETRY_BASE),
+            (2, OUTBOX_RETRY_BASE * 2),
+            (3, OUTBOX_RETRY_BASE * 4),
+        ):
+            with self.subTest(attempts=attempts):
+                self.fail_outbox_event.reset_mock()
+                await self.outbox._process(make_event(attempts))
+                self.assertEqual(self.get_retry_in(), expected)
+
+    async def test_retry_backoff_is_capped(self):
+        self.handler.side_effect = RuntimeError("send failed")
+        with patch.object(outbox_module, "OUTBOX_RETRY_MAX", 12):
+            await self.outbox._process(make_event(OUTBOX_MAX_ATTEMPTS - 1))
+        self.assertEqual(self.get_retry_in(), 12)
+
+    async def test_failed_after_max_attempts(self):
+        self.handler.side_effect = RuntimeError("send failed")
+        await self.outbox._process(make_event(OUTBOX_MAX_ATTEMPTS))
+        self.assertIsNone(self.get_retry_in())
+        self.assertIn("send failed", self.fail_outbox_event.await_args.args[1])
+
+    async def test_unknown_event_type(self):
+        await self.outbox._process(make_event(1, event_type="unknown"))
+        self.handler.assert_not_awaited()
+        self.assertEqual(self.get_retry_in(), OUTBOX_RETRY_BASE)
@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from aiogram.types import CallbackQuery, Chat, Message, User
+from handlers.outdated_callbacks import outdated_callback
+from locales.constants_text_ru import OUTDATED_MENU
+
+
+def make_call(message=None) -> CallbackQuery:
+    return CallbackQuery(
+        id="1",
+        from_user=User(id=1, is_bot=False, first_name="Test"),
+        chat_instance="test",
+        data="product:5:1:3",
+        message=message,
+    )
+
+
+class OutdatedCallbackTests(unittest.IsolatedAsyncioTestCase):
+    """На кнопки устаревших клавиатур бот отвечает и даёт главное меню."""
+
+    def setUp(self):
+        for target, name in (
+            (CallbackQuery, "answer"),
+            (Message, "edit_text"),
+            (Message, "answer"),
+        ):
+            patcher = patch.object(target, name, AsyncMock())
+            setattr(self, f"{target.__name__}_{name}", patcher.start())
+            self.addCleanup(patcher.stop)
+
+    async def test_answers_and_shows_main_menu(self):
+        message = Message(
+            message_id=1,
+            date=datetime.now(),
+            chat=Chat(id=1, type="private"),
+            text="Старое меню",
+        )
+        await outdated_callback(make_call(message))
+
+        self.CallbackQuery_answer.assert_awaited_once_with(OUTDATED_MENU)
+        self.Message_edit_text.assert_awaited_once()
+        self.assertEqual(
+            self.Message_edit_text.await_args.args[0], OUTDATED_MENU
+        )
+
+    async def test_inaccessible_message(self):
+        await outdated_callback(make_call())
+
+        self.CallbackQuery_answer.assert_awaited_once_with(OUTDATED_MENU)
+        self.Message_edit_text.assert_not_awaited()
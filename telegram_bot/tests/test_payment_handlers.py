@@ -0,0 +1,68 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+from aiogram.types import PreCheckoutQuery, User
+from handlers import payment_handlers
+from locales.constants_text_ru import (
+    PRE_CHECKOUT_CART_EMPTY,
+    PRE_CHECKOUT_ERROR,
+)
+from sqlalchemy.exc import OperationalError
+
+
+def make_query(payload: str = "111", total_amount: int = 1000):
+    return PreCheckoutQuery(
+        id="query",
+        from_user=User(id=111, is_bot=False, first_name="Test"),
+        currency="RUB",
+        total_amount=total_amount,
+        invoice_payload=payload,
+    )
+
+
+class PreCheckoutQueryTests(unittest.IsolatedAsyncioTestCase):
+    """На pre_checkout_query бот отвечает всегда, даже при ошибке."""
+
+    def setUp(self):
+        patcher = patch.object(payment_handlers, "bot")
+        self.bot = patcher.start()
+        self.bot.answer_pre_checkout_query = AsyncMock()
+        self.addCleanup(patcher.stop)
+
+    def patch_cart_total(self, **kwargs):
+        patcher = patch.object(
+            payment_handlers, "get_cart_total", AsyncMock(**kwargs)
+        )
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def assert_answered(self, ok: bool, error_message):
+        self.bot.answer_pre_checkout_query.assert_awaited_once_with(
+            "query", ok=ok, error_message=error_message
+        )
+
+    async def test_ok(self):
+        self.patch_cart_total(return_value=(Decimal("10.00"), 1))
+        await payment_handlers.pre_checkout_query(make_query(), None)
+        self.assert_answered(True, None)
+
+    async def test_empty_cart(self):
+        self.patch_cart_total(return_value=(Decimal(0), 0))
+        await payment_handlers.pre_checkout_query(make_query(), None)
+        self.assert_answered(False, PRE_CHECKOUT_CART_EMPTY)
+
+    async def test_database_error(self):
+        self.patch_cart_total(
+            side_effect=OperationalError("SELECT", {}, Exception("down"))
+        )
+        await payment_handlers.pre_checkout_query(make_query(), None)
+        self.assert_answered(False, PRE_CHECKOUT_ERROR)
+
+    async def test_bad_payload(self):
+        get_cart_total = self.patch_cart_total()
+        await payment_handlers.pre_checkout_query(
+            make_query(payload="not-a-user-id"), None
+        )
+        get_cart_total.assert_not_awaited()
+        self.assert_answered(False, PRE_CHECKOUT_ERROR)
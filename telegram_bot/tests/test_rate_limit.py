@@ -0,0 +1,48 @@
+import unittest
+
+from aiogram.methods import (
+    AnswerCallbackQuery,
+    BanChatMember,
+    DeleteMessage,
+    EditMessageText,
+    GetChatMember,
+    SendChatAction,
+    SendMessage,
+    SendPhoto,
+)
+from middlewares.RateLimitMiddleware import RateLimitMiddleware
+
+
+class ChatBucketTests(unittest.TestCase):
+    """Лимит чата применяется только к отправке и правке сообщений."""
+
+    def setUp(self):
+        self.middleware = RateLimitMiddleware()
+
+    def test_send_and_edit_are_limited(self):
+        for method in (
+            SendMessage(chat_id=1, text="text"),
+            SendPhoto(chat_id=1, photo="file_id"),
+            EditMessageText(chat_id=1, message_id=1, text="text"),
+        ):
+            with self.subTest(method=type(method).__name__):
+                self.assertIsNotNone(self.middleware._chat_bucket(method))
+
+    def test_bucket_is_shared_per_chat(self):
+        first = self.middleware._chat_bucket(SendMessage(chat_id=1, text="a"))
+        second = self.middleware._chat_bucket(
+            EditMessageText(chat_id=1, message_id=1, text="b")
+        )
+        self.assertIs(first, second)
+
+    def test_other_methods_are_not_limited(self):
+        for method in (
+            AnswerCallbackQuery(callback_query_id="1"),
+            DeleteMessage(chat_id=1, message_id=1),
+            SendChatAction(chat_id=1, action="typing"),
+            BanChatMember(chat_id=-1001, user_id=1),
+            GetChatMember(chat_id=-1001, user_id=1),
+            EditMessageText(inline_message_id="1", text="text"),
+        ):
+            with self.subTest(method=type(method).__name__):
+                self.assertIsNone(self.middleware._chat_bucket(method))
@@ -1,3 +1,10 @@
-from .pagination import Pagination
+from .pagination import Pagination, DBPagination
+from .lru_cache import LRUCache
+from .token_bucket import TokenBucket
 
-__all__ = "Pagination"
+__all__ = (
+    "Pagination",
+    "DBPagination",
+    "LRUCache",
+    "TokenBucket",
+)
@@ -5,7 +5,12 @@ from constants import BUTTONS_PER_PAGE
 
 
 class Pagination:
-    """Класс реализует пагинацию."""
+    """
+    Класс реализует пагинацию.
+
+    version — версия снимка каталога, из которого взяты items;
+    по ней кэшируется готовая клавиатура страницы.
+    """
 
     def __init__(
         self,
@@ -13,8 +18,10 @@ class Pagination:
         items: List,
         page: int = 1,
         per_page: int = BUTTONS_PER_PAGE,
+        version: Optional[int] = None,
     ):
         self.level = level
+        self.version = version
         self.items = items
         self.per_page = per_page
         self.page = page
@@ -40,3 +47,25 @@ class Pagination:
         if self.page > 1:
             return self.page - 1
         return False
+
+
+class DBPagination(Pagination):
+    """
+    Пагинация по странице, выбранной из БД: items содержит только
+    текущую страницу, total — общее число записей уровня.
+    """
+
+    def __init__(
+        self,
+        level: str,
+        items: List,
+        total: int,
+        page: int = 1,
+        per_page: int = BUTTONS_PER_PAGE,
+    ):
+        super().__init__(level, items, page, per_page)
+        self.len = total
+        self.pages = math.ceil(self.len / self.per_page)
+
+    def get_page(self):
+        return self.items
@@ -0,0 +1,33 @@
+import time
+
+
+class TokenBucket:
+    """Ведро токенов: rate токенов в секунду, не больше capacity."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def delay(self, reserve: float = 0) -> float:
+        """Сколько ждать, пока в ведре будет токен сверх reserve."""
+        self._refill()
+        return max(1 + reserve - self.tokens, 0) / self.rate
+
+    def consume(self) -> None:
+        self.tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        """Не выдавать токены ближайшие seconds секунд."""
+        self._refill()
+        self.tokens = min(self.tokens, 1 - (seconds * self.rate))
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Dict
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import (
+    SimpleRequestHandler,
+    setup_application,
+)
+from aiohttp import web
+from config import UPDATES_CONCURRENCY, WEBHOOK_PATH, WEBHOOK_SECRET
+
+
+class BoundedRequestHandler(SimpleRequestHandler):
+    """
+    Сразу отвечает Telegram и обрабатывает обновления в фоне,
+    одновременно не более concurrency штук.
+    """
+
+    def __init__(self, *args: Any, concurrency: int, **kwargs: Any):
+        super().__init__(*args, handle_in_background=True, **kwargs)
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _background_feed_update(
+        self, bot: Bot, update: Dict[str, Any]
+    ) -> None:
+        async with self._semaphore:
+            await super()._background_feed_update(bot, update)
+
+
+def create_app(dp: Dispatcher, bot: Bot) -> web.Application:
+    """Приложение aiohttp, принимающее обновления на WEBHOOK_PATH."""
+
+    if not WEBHOOK_SECRET:
+        raise RuntimeError("Для режима webhook нужен WEBHOOK_SECRET")
+
+    app = web.Application()
+    BoundedRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=WEBHOOK_SECRET,
+        concurrency=UPDATES_CONCURRENCY,
+    ).register(app, path=WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+    return app